@@ -0,0 +1,42 @@
+"""Add generated full_name column for contacts
+
+Revision ID: 37bc53c12cf5
+Revises: 76974037cfac
+Create Date: 2026-10-14 12:31:08.417265
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "37bc53c12cf5"
+down_revision: Union[str, None] = "76974037cfac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "full_name",
+            sa.String(),
+            sa.Computed("first_name || ' ' || last_name", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_contacts_owner_full_name",
+        "contacts",
+        ["owner_id", "full_name"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contacts_owner_full_name", table_name="contacts")
+    op.drop_column("contacts", "full_name")
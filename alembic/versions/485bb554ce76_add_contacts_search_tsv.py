@@ -0,0 +1,39 @@
+"""Add full-text search column for contacts
+
+Revision ID: 485bb554ce76
+Revises: c1506b9efdf2
+Create Date: 2026-10-14 11:03:54.902318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "485bb554ce76"
+down_revision: Union[str, None] = "c1506b9efdf2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE contacts ADD COLUMN search_tsv tsvector GENERATED ALWAYS AS "
+        "(to_tsvector('simple', coalesce(first_name, '') || ' ' || "
+        "coalesce(last_name, '') || ' ' || coalesce(email, ''))) STORED"
+    )
+    op.create_index(
+        "ix_contacts_search_tsv",
+        "contacts",
+        ["search_tsv"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_contacts_search_tsv", table_name="contacts")
+    op.drop_column("contacts", "search_tsv")
@@ -0,0 +1,31 @@
+"""Add day-of-year index for contact birthdays
+
+Revision ID: 76974037cfac
+Revises: 485bb554ce76
+Create Date: 2026-10-14 11:47:20.551093
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "76974037cfac"
+down_revision: Union[str, None] = "485bb554ce76"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The expression must stay in sync with _BIRTHDAY_DOY in src/contacts/repo.py.
+    op.execute(
+        "CREATE INDEX ix_contacts_owner_birthday_doy ON contacts "
+        "(owner_id, (CAST(EXTRACT(doy FROM birthday) AS INTEGER)))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_contacts_owner_birthday_doy")
@@ -0,0 +1,37 @@
+"""Index contact birthdays by month and day instead of day of year
+
+Revision ID: 9203b69927ed
+Revises: 37bc53c12cf5
+Create Date: 2026-10-14 15:02:41.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9203b69927ed"
+down_revision: Union[str, None] = "37bc53c12cf5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_contacts_owner_birthday_doy")
+    # The expression must stay in sync with _BIRTHDAY_MONTH_DAY in src/contacts/repo.py.
+    op.execute(
+        "CREATE INDEX ix_contacts_owner_birthday_month_day ON contacts "
+        "(owner_id, (CAST(EXTRACT(month FROM birthday) AS INTEGER) * 100 "
+        "+ CAST(EXTRACT(day FROM birthday) AS INTEGER)))"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_contacts_owner_birthday_month_day")
+    op.execute(
+        "CREATE INDEX ix_contacts_owner_birthday_doy ON contacts "
+        "(owner_id, (CAST(EXTRACT(doy FROM birthday) AS INTEGER)))"
+    )
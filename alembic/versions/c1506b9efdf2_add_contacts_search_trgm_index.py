@@ -0,0 +1,33 @@
+"""Add trigram index for contacts search
+
+Revision ID: c1506b9efdf2
+Revises: 28f5f80e6648
+Create Date: 2026-10-14 10:12:31.418205
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c1506b9efdf2"
+down_revision: Union[str, None] = "28f5f80e6648"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # The expression must stay in sync with _SEARCH_DOCUMENT in src/contacts/repo.py.
+    op.execute(
+        "CREATE INDEX ix_contacts_search_trgm ON contacts USING gin "
+        "((lower(first_name) || ' ' || lower(last_name) || ' ' || lower(email)) "
+        "gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_contacts_search_trgm")
@@ -5,7 +5,18 @@ from config.general import settings
 
 SQLALCHEMY_DATABASE_URL = settings.database_url
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+# Pool sizing only applies to server databases; SQLite uses its own pool classes.
+pool_options = (
+    {}
+    if SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+    else {"pool_size": 10, "max_overflow": 20, "pool_recycle": 1800}
+)
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    query_cache_size=1200,
+    **pool_options,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -13,10 +13,15 @@ class Settings(BaseSettings):
     mail_server: str
     redis_host: str
     redis_port: int
+    redis_max_connections: int = 64
+    contacts_cache_ttl: int = 30
     origins: str
+    base_url: str = "http://localhost:8000"
     cloudinary_name: str
     cloudinary_api_key: str
     cloudinary_api_secret: str
+    bcrypt_rounds: int = 12
+    log_level: str = "INFO"
 
     class Config:
         env_file = ".env"
@@ -1,14 +1,20 @@
+import cloudinary
+import logging
 from fastapi import Depends, FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
 import uvicorn
 from src.contacts.routers import router as router_contacts
 from src.auth.routers import router as router_auth
 from config.general import settings
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+logging.basicConfig(level=settings.log_level.upper())
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 app.include_router(router_contacts, prefix="/contacts", tags=["contacts"])
 app.include_router(router_auth, prefix="/auth", tags=["auth"])
@@ -26,10 +32,24 @@ app.add_middleware(
 
 @app.on_event("startup")
 async def startup():
-    redis = Redis(host=settings.redis_host, port=settings.redis_port)
-    print("Initializing FastAPILimiter...")
+    cloudinary.config(
+        cloud_name=settings.cloudinary_name,
+        api_key=settings.cloudinary_api_key,
+        api_secret=settings.cloudinary_api_secret,
+        secure=True,
+    )
+    pool = ConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        max_connections=settings.redis_max_connections,
+        socket_keepalive=True,
+        health_check_interval=30,
+        decode_responses=False,
+    )
+    redis = Redis(connection_pool=pool)
+    logger.info("Initializing FastAPILimiter...")
     await FastAPILimiter.init(redis)
-    print("FastAPILimiter initialized.")
+    logger.info("FastAPILimiter initialized.")
 
 
 @app.get("/", dependencies=[Depends(RateLimiter(times=2, seconds=5))])
@@ -1,7 +1,16 @@
-from passlib.context import CryptContext
+import asyncio
+import os
+import bcrypt
 
+from concurrent.futures import ThreadPoolExecutor
+from config.general import settings
 
-pwd_contex = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt releases the GIL while hashing, so a dedicated thread pool sized to the
+# CPU count lets concurrent logins scale with cores without starving the
+# default threadpool that serves sync routes and DB calls.
+_bcrypt_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="bcrypt"
+)
 
 
 def get_password_hash(password: str) -> str:
@@ -14,9 +23,24 @@ def get_password_hash(password: str) -> str:
     Returns:
     str: The hashed password. This hashed password can be safely stored in a database.
     """
-    return pwd_contex.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+    return bcrypt.hashpw(password.encode(), salt).decode()
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """This function verifies password using bcrypt"""
-    return pwd_contex.verify(password, hashed_password)
+    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Runs get_password_hash in the dedicated bcrypt pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, get_password_hash, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """Runs verify_password in the dedicated bcrypt pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _bcrypt_pool, verify_password, password, hashed_password
+    )
@@ -1,38 +1,64 @@
-from functools import lru_cache
-from fastapi import HTTPException, status
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from src.auth.models import Role, User
 from src.auth.schemas import RoleEnum, UserCreate
 from src.auth.pass_utils import get_password_hash
 
+# Roles are static RoleEnum rows, so their ids are cached process-wide.
+# Only the primitive id is stored, never an ORM object bound to a session.
+_ROLE_CACHE: dict[RoleEnum, int] = {}
+
+# Dialect-specific INSERTs that support ON CONFLICT; SQLite is used by the tests.
+_UPSERT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+
 
 class UserRepository:
     def __init__(self, session):
         self.session = session
 
-    def create_user(self, user_create: UserCreate) -> User:
+    def create_user(
+        self, user_create: UserCreate, hashed_password: str | None = None
+    ) -> User | None:
         """
         Creates a new user in the database.
 
         Parameters:
         user_create (UserCreate): An instance of UserCreate containing the necessary information for creating a new user.
+        hashed_password (str, optional): A precomputed bcrypt hash of the password.
+        If not provided, the password from user_create is hashed here.
 
         Returns:
-        User: The newly created user instance.
+        User | None: The newly created user instance, or None if the email is already registered.
+        The user is created with a single INSERT ... ON CONFLICT (email) DO NOTHING RETURNING statement,
+        so no separate existence check or refresh is needed. The returned user is not expired by the commit,
+        so reading its columns and role afterwards issues no further queries.
         """
-        hashed_password = get_password_hash(user_create.password)
-        user_role = RoleRepository(self.session).get_role_by_name(user_create.role)
-        new_user = User(
-            username=user_create.username,
-            hashed_password=hashed_password,
-            email=user_create.email,
-            role_id=user_role.id,  # Setting the role ID
-            is_active=False,
+        if hashed_password is None:
+            hashed_password = get_password_hash(user_create.password)
+        role_id = RoleRepository(self.session).get_role_id_by_name(user_create.role)
+        insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name, pg_insert)
+        stmt = (
+            insert(User)
+            .values(
+                username=user_create.username,
+                hashed_password=hashed_password,
+                email=user_create.email,
+                role_id=role_id,  # Setting the role ID
+                is_active=False,
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User)
         )
-        self.session.add(new_user)
-        self.session.commit()
-        self.session.refresh(new_user)
+        new_user = self.session.scalar(stmt)
+        # RETURNING already loaded every column and the role; keep them readable past the commit.
+        expire_on_commit = self.session.expire_on_commit
+        self.session.expire_on_commit = False
+        try:
+            self.session.commit()
+        finally:
+            self.session.expire_on_commit = expire_on_commit
         return new_user
 
     def get_user(self, username: str) -> User:
@@ -46,8 +72,7 @@ class UserRepository:
         User: The user with the specified username. If no user is found, returns None.
         """
         query = select(User).where(User.username == username)
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+        return self.session.scalar(query)
 
     def get_user_by_email(self, email: str) -> User:
         """
@@ -62,48 +87,35 @@ class UserRepository:
         If a user is found, it is returned. Otherwise, None is returned.
         """
         query = select(User).where(User.email == email)
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+        return self.session.scalar(query)
 
     def activate_user(self, user: User):
         """
         Activates a user in the database.
 
         Parameters:
-        user (User): The user instance to be activated. The user's 'is_active' attribute will be set to True.
+        user (User): The already loaded user instance to be activated. The user's 'is_active' attribute will be set to True.
 
         Returns:
         None: This function does not return any value. It updates the 'is_active' attribute of the given user in the database.
         """
         user.is_active = True
-        self.session.add(user)
         self.session.commit()
-        self.session.refresh(user)
 
-    def update_avatar(self, email: str, url: str) -> User:
+    def update_avatar(self, user: User, url: str) -> User:
         """
-        Updates the avatar URL of a user in the database based on their email address.
+        Updates the avatar URL of a user in the database.
 
         Parameters:
-        email (str): The email address of the user whose avatar needs to be updated.
+        user (User): The already loaded user instance whose avatar needs to be updated.
         url (str): The new avatar URL to be set for the user.
 
         Returns:
-        User: The updated user instance with the new avatar URL. If the user is not found,
-        an HTTPException with a 404 status code and a "User not found" detail is raised.
+        User: The updated user instance with the new avatar URL.
 
-        This function first queries the database for a user with the given email address.
-        If a user is found, the avatar URL is updated, the changes are committed to the database,
-        and the updated user instance is refreshed from the database before being returned.
-        If no user is found, an HTTPException is raised.
+        The user is passed in by the caller, so no additional lookup query is issued.
+        The changes are committed to the database and the user instance is refreshed before being returned.
         """
-        query = select(User).where(User.email == email)
-        result = self.session.execute(query)
-        user = result.scalar_one_or_none()
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
-            )
         user.avatar = url
         self.session.commit()
         self.session.refresh(user)
@@ -114,7 +126,6 @@ class RoleRepository:
     def __init__(self, session):
         self.session = session
 
-    @lru_cache
     def get_role_by_name(self, name: RoleEnum):
         """
         Retrieves a role from the database based on its name.
@@ -122,10 +133,29 @@ class RoleRepository:
         name (RoleEnum): The name of the role to retrieve. The name is expected to be a member of the RoleEnum class.
         Returns:
         Role: The role with the specified name. If no role is found, returns None.
-        This function uses SQLAlchemy's select statement to query the database for a role with the given name.
-        The result is cached using the lru_cache decorator to improve performance.
-        If a role is found, it is returned. Otherwise, None is returned.
+        If the role id is already cached, the role is loaded through the session's identity map by primary key.
+        Otherwise, SQLAlchemy's select statement is used to query the database by name and the id is cached.
         """
+        role_id = _ROLE_CACHE.get(name)
+        if role_id is not None:
+            return self.session.get(Role, role_id)
         query = select(Role).where(Role.name == name.value)
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+        role = self.session.scalar(query)
+        if role is not None:
+            _ROLE_CACHE[name] = role.id
+        return role
+
+    def get_role_id_by_name(self, name: RoleEnum) -> int | None:
+        """
+        Retrieves the id of a role based on its name.
+        Parameters:
+        name (RoleEnum): The name of the role. The name is expected to be a member of the RoleEnum class.
+        Returns:
+        int | None: The id of the role, or None if no such role exists.
+        The id is served from the process-wide cache and only queried on the first lookup.
+        """
+        role_id = _ROLE_CACHE.get(name)
+        if role_id is None:
+            role = self.get_role_by_name(name)
+            role_id = role.id if role is not None else None
+        return role_id
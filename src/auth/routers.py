@@ -1,7 +1,9 @@
+import asyncio
 import cloudinary
 import cloudinary.uploader
 import logging
 
+from pathlib import Path
 from fastapi import (
     APIRouter,
     Depends,
@@ -13,10 +15,11 @@ from fastapi import (
 )
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from src.auth.models import User
 from src.auth.email_utils import send_verification
-from src.auth.pass_utils import verify_password
+from src.auth.pass_utils import get_password_hash_async, verify_password_async
 from src.auth.utils import (
     create_access_token,
     create_refresh_token,
@@ -25,23 +28,71 @@ from src.auth.utils import (
     get_current_user,
 )
 from src.auth.repo import UserRepository
-from src.auth.schemas import Token, UserBase, UserCreate, UserResponse
+from src.auth.schemas import LoginRequest, Token, UserBase, UserCreate, UserResponse
 from config.db import get_db
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, meta
 from config.general import settings
 
 router = APIRouter()
-env = Environment(loader=FileSystemLoader("src/templates"))
+_VERIFY_PREFIX = f"{settings.base_url}/auth/verify-email?token="
+env = Environment(
+    loader=FileSystemLoader(Path(__file__).resolve().parent.parent / "templates"),
+    auto_reload=False,
+    cache_size=400,
+)
+_VERIFY_TEMPLATE = env.get_template("verification_email.html")
+_LINK_SENTINEL = "{{__LINK__}}"
+
+
+def _split_verify_template() -> tuple[str, str] | None:
+    """
+    Pre-renders the verification template around a sentinel link.
+
+    Returns:
+    tuple[str, str] | None: The fragments before and after the link, or None if the template
+    uses anything other than a single verification_link placeholder.
+    """
+    source, _, _ = env.loader.get_source(env, "verification_email.html")
+    if meta.find_undeclared_variables(env.parse(source)) != {"verification_link"}:
+        return None
+    parts = _VERIFY_TEMPLATE.render(verification_link=_LINK_SENTINEL).split(
+        _LINK_SENTINEL
+    )
+    return (parts[0], parts[1]) if len(parts) == 2 else None
+
+
+_VERIFY_TEMPLATE_PARTS = _split_verify_template()
+
+
+def _render_verification_email(verification_link: str) -> str:
+    """Renders the verification email, joining the pre-rendered fragments when possible."""
+    if _VERIFY_TEMPLATE_PARTS is None:
+        return _VERIFY_TEMPLATE.render(verification_link=verification_link)
+    head, tail = _VERIFY_TEMPLATE_PARTS
+    return head + verification_link + tail
+
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
+def get_user_repo(db: Session = Depends(get_db)) -> UserRepository:
+    """
+    Provides a UserRepository bound to the request's database session.
+
+    Parameters:
+    db (Session): The database session. Defaults to Depends(get_db).
+
+    Returns:
+    UserRepository: The repository for the current request.
+    """
+    return UserRepository(db)
+
+
 @router.patch("/avatar", response_model=UserResponse)
 async def update_avatar_user(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    user_repo: UserRepository = Depends(get_user_repo),
 ):
     """
     Updates the avatar of the currently logged-in user.
@@ -49,7 +100,7 @@ async def update_avatar_user(
     Parameters:
     file (UploadFile): The uploaded image file.
     current_user (User): The currently logged-in user.
-    db (Session): The database session.
+    user_repo (UserRepository): The user repository bound to the request's database session.
 
     Returns:
     UserResponse: The updated user with the new avatar URL.
@@ -59,14 +110,7 @@ async def update_avatar_user(
     HTTPException: If any other error occurs during the update process.
     """
     try:
-        cloudinary.config(
-            cloud_name=settings.cloudinary_name,
-            api_key=settings.cloudinary_api_key,
-            api_secret=settings.cloudinary_api_secret,
-            secure=True,
-        )
-        user_repo = UserRepository(db)
-        result = cloudinary.uploader.upload(file.file)
+        result = await asyncio.to_thread(cloudinary.uploader.upload, file.file)
 
         url = result.get("secure_url")
         if not url:
@@ -77,7 +121,7 @@ async def update_avatar_user(
 
         logger.debug(f"Updating user avatar URL to {url}")
 
-        user = user_repo.update_avatar(current_user.email, url)
+        user = await run_in_threadpool(user_repo.update_avatar, current_user, url)
         return user
 
     except Exception as e:
@@ -91,22 +135,24 @@ async def update_avatar_user(
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def register(
+async def register(
     user_create: UserCreate,  # The user data to be registered.
     background_tasks: BackgroundTasks,  # FastAPI's BackgroundTasks instance for handling asynchronous tasks.
-    db: Session = Depends(
-        get_db
-    ),  # The database session for interacting with the database.
+    user_repo: UserRepository = Depends(
+        get_user_repo
+    ),  # The user repository bound to the request's database session.
 ):
     """
     Registers a new user by creating a new User record in the database.
     If the email is already registered, it raises a 409 Conflict HTTPException.
+    The password is hashed before the insert, which doubles as the conflict check,
+    so a duplicate-email request still pays for one bcrypt hash before the 409.
     It also sends a verification email to the user's email address.
 
     Parameters:
     user_create (UserCreate): The user data to be registered.
     background_tasks (BackgroundTasks): FastAPI's BackgroundTasks instance for handling asynchronous tasks.
-    db (Session): The database session for interacting with the database.
+    user_repo (UserRepository): The user repository bound to the request's database session.
 
     Returns:
     UserResponse: The newly created user record.
@@ -114,20 +160,16 @@ def register(
     Raises:
     HTTPException: If the email is already registered.
     """
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_email(user_create.email)
-    if user:
+    hashed_password = await get_password_hash_async(user_create.password)
+    user = await run_in_threadpool(user_repo.create_user, user_create, hashed_password)
+    if user is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
         )
-    user = user_repo.create_user(user_create)
     verification_token = create_verification_token(user.email)
-    verification_link = (
-        f"http://localhost:8000/auth/verify-email?token={verification_token}"
-    )
+    verification_link = _VERIFY_PREFIX + verification_token
 
-    template = env.get_template("verification_email.html")
-    email_body = template.render(verification_link=verification_link)
+    email_body = _render_verification_email(verification_link)
 
     background_tasks.add_task(send_verification, user.email, email_body)
 
@@ -135,13 +177,13 @@ def register(
 
 
 @router.get("/verify-email")
-def verify_email(token: str, db: Session = Depends(get_db)):
+def verify_email(token: str, user_repo: UserRepository = Depends(get_user_repo)):
     """
     Verifies the user's email by decoding the verification token and activating the user's account.
 
     Parameters:
     token (str): The verification token sent to the user's email.
-    db (Session): The database session for interacting with the database.
+    user_repo (UserRepository): The user repository bound to the request's database session.
 
     Returns:
     dict: A dictionary with a success message "Email verified successfully".
@@ -150,7 +192,6 @@ def verify_email(token: str, db: Session = Depends(get_db)):
     HTTPException: If the user with the given email is not found in the database.
     """
     email: str = decode_verification_token(token)
-    user_repo = UserRepository(db)
     user = user_repo.get_user_by_email(email)
     if user is None:
         raise HTTPException(
@@ -160,31 +201,25 @@ def verify_email(token: str, db: Session = Depends(get_db)):
     return {"msg": "Email verified successfully"}
 
 
-@router.post("/token", response_model=Token, status_code=status.HTTP_201_CREATED)
-def login_for_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
-):
+async def _issue_tokens(
+    user_repo: UserRepository, username: str, password: str
+) -> dict:
     """
-    Authenticates a user and generates access and refresh tokens.
+    Authenticates a user by email and password and generates access and refresh tokens.
 
     Parameters:
-    form_data (OAuth2PasswordRequestForm): The username and password provided by the user.
-    This is obtained from the request body using FastAPI's Depends() function.
-    db (Session): The database session for interacting with the database.
-    This is obtained from the FastAPI's Depends() function.
+    user_repo (UserRepository): The user repository bound to the request's database session.
+    username (str): The email address of the user.
+    password (str): The plain-text password of the user.
 
     Returns:
     dict: A dictionary containing the access token, refresh token, and token type.
-    The access token is used for subsequent authenticated requests,
-    while the refresh token can be used to generate new access tokens.
 
     Raises:
     HTTPException: If the provided email or password is incorrect.
-    This exception is raised with a 401 Unauthorized status code and appropriate error details.
     """
-    user_repo = UserRepository(db)
-    user = user_repo.get_user_by_email(form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await run_in_threadpool(user_repo.get_user_by_email, username)
+    if not user or not await verify_password_async(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -199,6 +234,57 @@ def login_for_token(
     }
 
 
+@router.post("/token", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def login_for_token(
+    body: LoginRequest, user_repo: UserRepository = Depends(get_user_repo)
+):
+    """
+    Authenticates a user and generates access and refresh tokens.
+
+    Parameters:
+    body (LoginRequest): The username (email) and password provided by the user as a JSON body.
+    user_repo (UserRepository): The user repository bound to the request's database session.
+    This is obtained from the FastAPI's Depends() function.
+
+    Returns:
+    dict: A dictionary containing the access token, refresh token, and token type.
+    The access token is used for subsequent authenticated requests,
+    while the refresh token can be used to generate new access tokens.
+
+    Raises:
+    HTTPException: If the provided email or password is incorrect.
+    This exception is raised with a 401 Unauthorized status code and appropriate error details.
+    """
+    return await _issue_tokens(user_repo, body.username, body.password)
+
+
+@router.post("/token-form", response_model=Token, status_code=status.HTTP_201_CREATED)
+async def login_for_token_form(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    user_repo: UserRepository = Depends(get_user_repo),
+):
+    """
+    Authenticates a user with form data and generates access and refresh tokens.
+
+    This endpoint keeps the OAuth2 password flow working for tooling such as the Swagger UI,
+    which submits credentials as form data.
+
+    Parameters:
+    form_data (OAuth2PasswordRequestForm): The username and password provided by the user.
+    This is obtained from the request body using FastAPI's Depends() function.
+    user_repo (UserRepository): The user repository bound to the request's database session.
+    This is obtained from the FastAPI's Depends() function.
+
+    Returns:
+    dict: A dictionary containing the access token, refresh token, and token type.
+
+    Raises:
+    HTTPException: If the provided email or password is incorrect.
+    This exception is raised with a 401 Unauthorized status code and appropriate error details.
+    """
+    return await _issue_tokens(user_repo, form_data.username, form_data.password)
+
+
 @router.post("/refresh", response_model=Token, status_code=status.HTTP_201_CREATED)
 def refresh_token():
     """
@@ -34,6 +34,11 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class LoginRequest(BaseModel):
+    username: EmailStr
+    password: str
+
+
 class Token(BaseModel):
     access_token: str
     refresh_token: str
@@ -1,9 +1,14 @@
+import base64
+import hmac
+import logging
 import os
+import time
 import cloudinary.uploader
+import orjson
 
-from datetime import datetime, timedelta, timezone
+from cachetools import TLRUCache
+from datetime import timedelta
 from fastapi import Depends, HTTPException, status
-from jose import JWTError, jwt
 from src.auth.repo import UserRepository
 from src.auth.schemas import UserResponse
 from src.auth.models import User
@@ -12,15 +17,126 @@ from src.auth.schemas import RoleEnum, TokenData
 from dotenv import load_dotenv
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from threading import RLock
 
 load_dotenv()
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+logger = logging.getLogger(__name__)
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token-form")
 SECRET_KEY = os.getenv("SECRET_KEY")
+_SECRET_BYTES = SECRET_KEY.encode("utf-8")
+# Keyed once; copying it per token skips re-deriving the HMAC pads from the secret.
+_HMAC_TEMPLATE = hmac.new(_SECRET_BYTES, digestmod="sha256")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 REFRESH_TOKEN_EXPIRE_DAYS = 7
 VERIFICATION_TOKEN_HOUSE = 24
+TOKEN_CACHE_MAXSIZE = 4096
+TOKEN_CACHE_TTL_SECONDS = 60
+
+
+def _token_ttu(_token: str, entry: tuple, now: float) -> float:
+    """Expires a cached token entry after the cache TTL or at the token's own exp, whichever is first."""
+    expire, _ = entry
+    return min(now + TOKEN_CACHE_TTL_SECONDS, expire)
+
+
+_access_token_cache = TLRUCache(
+    maxsize=TOKEN_CACHE_MAXSIZE, ttu=_token_ttu, timer=time.time
+)
+_verification_token_cache = TLRUCache(
+    maxsize=TOKEN_CACHE_MAXSIZE, ttu=_token_ttu, timer=time.time
+)
+_token_cache_lock = RLock()
+
+
+class InvalidTokenError(Exception):
+    """Raised when a JWT is malformed, has an invalid signature or is expired."""
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+# The JOSE header never changes, so it is serialized and encoded only once.
+_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+
+def _sign(signing_input: bytes) -> bytes:
+    mac = _HMAC_TEMPLATE.copy()
+    mac.update(signing_input)
+    return mac.digest()
+
+
+def _get_cached_token(cache: TLRUCache, token: str):
+    with _token_cache_lock:
+        entry = cache.get(token)
+    return entry[1] if entry is not None else None
+
+
+def _cache_token(cache: TLRUCache, token: str, payload: dict, value) -> None:
+    expire = payload.get("exp", float("inf"))
+    with _token_cache_lock:
+        cache[token] = (expire, value)
+
+
+def _encode(data: dict, expire: float) -> str:
+    """
+    Signs data as an HS256 JWT with a numeric exp claim.
+
+    Parameters:
+    data (dict): The claims to be encoded in the JWT.
+    expire (float): The expiration time as a Unix timestamp.
+
+    Returns:
+    str: The encoded JWT.
+    """
+    payload = {**data, "exp": int(expire)}
+    signing_input = _HEADER_B64 + b"." + _b64url(orjson.dumps(payload))
+    signature = _sign(signing_input)
+    return (signing_input + b"." + _b64url(signature)).decode()
+
+
+def _decode(token: str) -> dict:
+    """
+    Verifies an HS256 JWT and returns its claims.
+
+    Parameters:
+    token (str): The JWT to be verified.
+
+    Returns:
+    dict: The decoded claims.
+
+    Raises:
+    InvalidTokenError: If the token is malformed, its signature does not match or it is expired.
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.encode().split(b".")
+        if header_b64 != _HEADER_B64:
+            header = orjson.loads(_b64url_decode(header_b64))
+            if not isinstance(header, dict) or header.get("alg") != ALGORITHM:
+                raise InvalidTokenError("Unsupported token algorithm")
+        signature = _b64url_decode(signature_b64)
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError as e:
+        raise InvalidTokenError(f"Malformed token: {e}") from e
+    expected = _sign(header_b64 + b"." + payload_b64)
+    if not hmac.compare_digest(expected, signature):
+        raise InvalidTokenError("Signature verification failed")
+    if not isinstance(payload, dict):
+        raise InvalidTokenError("Invalid token payload")
+    exp = payload.get("exp")
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise InvalidTokenError("Expiration time claim must be a number")
+        if exp < time.time():
+            raise InvalidTokenError("Signature has expired")
+    return payload
 
 
 def create_verification_token(email: str) -> str:
@@ -33,10 +149,8 @@ def create_verification_token(email: str) -> str:
     Returns:
     str: The generated JWT verification token.
     """
-    expire = datetime.now(timezone.utc) + timedelta(hours=VERIFICATION_TOKEN_HOUSE)
-    to_encode = {"exp": expire, "sub": email}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    expire = time.time() + VERIFICATION_TOKEN_HOUSE * 3600
+    return _encode({"sub": email}, expire)
 
 
 def decode_verification_token(token: str) -> str | None:
@@ -50,14 +164,18 @@ def decode_verification_token(token: str) -> str | None:
     str | None: The email address extracted from the token if it is valid and not expired.
     Returns None if the token is invalid or expired.
     """
+    email = _get_cached_token(_verification_token_cache, token)
+    if email is not None:
+        return email
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode(token)
         email: str = payload.get("sub")
         if email is None:
             return None
-        return email
-    except JWTError:
+    except InvalidTokenError:
         return None
+    _cache_token(_verification_token_cache, token, payload, email)
+    return email
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -72,17 +190,11 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     Returns:
     str: The generated JWT access token.
     """
-    to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = time.time() + expires_delta.total_seconds()
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    print(f"Access token created2: {encoded_jwt}")
-    return encoded_jwt
+        expire = time.time() + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    return _encode(data, expire)
 
 
 def create_refresh_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -97,15 +209,11 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
     Returns:
     str: The generated JWT refresh token. This token can be used to obtain a new access token without requiring user credentials.
     """
-    to_encode = data.copy()
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = time.time() + expires_delta.total_seconds()
     else:
-        expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    print(f"Refresh token created2: {encoded_jwt}")
-    return encoded_jwt
+        expire = time.time() + REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    return _encode(data, expire)
 
 
 def decode_access_token(token: str) -> TokenData | None:
@@ -118,19 +226,23 @@ def decode_access_token(token: str) -> TokenData | None:
     Returns:
     TokenData | None: An instance of TokenData containing the username if the token is valid and not expired.
     Returns None if the token is invalid or expired.
-
-    Raises:
-    JWTError: If the token cannot be decoded due to invalid signature or expired time.
+    Successfully decoded tokens are cached until TOKEN_CACHE_TTL_SECONDS pass or the token expires.
     """
+    token_data = _get_cached_token(_access_token_cache, token)
+    if token_data is not None:
+        return token_data
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode(token)
         username: str = payload.get("sub")
         if username is None:
             return None
-        return TokenData(username=username)
-    except JWTError as e:
-        print(f"JWTError: {e}")
+        token_data = TokenData(username=username)
+    except InvalidTokenError as e:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Rejected access token: %s", e)
         return None
+    _cache_token(_access_token_cache, token, payload, token_data)
+    return token_data
 
 
 def get_current_user(
@@ -0,0 +1,99 @@
+import logging
+
+from fastapi_limiter import FastAPILimiter
+from redis.exceptions import RedisError
+
+from config.general import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "contacts"
+# Separates the next-page cursor from the cached JSON body in a stored value.
+_CURSOR_SEPARATOR = b"\n"
+
+
+def cache_key(owner_id: int, *parts) -> str:
+    """
+    Builds the Redis key for a cached contacts response of the given owner.
+
+    Parameters:
+    owner_id (int): The ID of the owner the response belongs to.
+    parts: The endpoint name and request parameters that identify the response.
+
+    Returns:
+    str: A key of the form "contacts:<owner_id>:<part>:...".
+    """
+    return ":".join(str(part) for part in (CACHE_PREFIX, owner_id, *parts))
+
+
+async def get_cached(key: str) -> tuple[bytes, str | None] | None:
+    """
+    Reads a cached response body and its next-page cursor.
+
+    The shared fastapi-limiter Redis connection is used. When Redis is not configured or fails,
+    the cache is skipped and None is returned.
+
+    Parameters:
+    key (str): The key built by cache_key.
+
+    Returns:
+    tuple[bytes, str | None] | None: The JSON body and the cursor, or None on a cache miss.
+    """
+    redis = FastAPILimiter.redis
+    if redis is None:
+        return None
+    try:
+        value = await redis.get(key)
+    except RedisError:
+        logger.warning("Contacts cache read failed for %s", key, exc_info=True)
+        return None
+    if value is None:
+        return None
+    cursor, _, body = value.partition(_CURSOR_SEPARATOR)
+    return body, cursor.decode() or None
+
+
+async def set_cached(key: str, body: bytes, cursor: str | None = None) -> None:
+    """
+    Stores a response body and its next-page cursor for settings.contacts_cache_ttl seconds.
+
+    Parameters:
+    key (str): The key built by cache_key.
+    body (bytes): The serialized JSON response body.
+    cursor (str | None): The next-page cursor to return with the body. Default is None.
+
+    Returns:
+    None
+    """
+    redis = FastAPILimiter.redis
+    if redis is None:
+        return
+    value = (cursor or "").encode() + _CURSOR_SEPARATOR + body
+    try:
+        await redis.set(key, value, ex=settings.contacts_cache_ttl)
+    except RedisError:
+        logger.warning("Contacts cache write failed for %s", key, exc_info=True)
+
+
+async def invalidate(owner_id: int | None = None) -> None:
+    """
+    Drops the cached contacts responses of one owner, or of every owner.
+
+    Parameters:
+    owner_id (int | None): The owner whose responses changed. None drops the whole cache. Default is None.
+
+    Returns:
+    None
+    """
+    redis = FastAPILimiter.redis
+    if redis is None:
+        return
+    prefix = CACHE_PREFIX if owner_id is None else cache_key(owner_id)
+    try:
+        keys = [key async for key in redis.scan_iter(match=f"{prefix}:*", count=500)]
+        if keys:
+            await redis.unlink(*keys)
+    except RedisError:
+        logger.warning(
+            "Contacts cache invalidation failed for %s", prefix, exc_info=True
+        )
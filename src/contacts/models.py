@@ -1,8 +1,11 @@
-from sqlalchemy import Date, Integer, String, ForeignKey
+from sqlalchemy import Computed, Date, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from config.db import Base
 
+# Contact.owner names "User" by string; import its module so the mappers can always be configured.
+from src.auth.models import User  # noqa: F401
+
 
 class Contact(Base):
     __tablename__ = "contacts"
@@ -14,6 +17,9 @@ class Contact(Base):
     phone_number: Mapped[str] = mapped_column(String, index=True)
     birthday: Mapped[Date] = mapped_column(Date)
     additional_info: Mapped[str | None] = mapped_column(String, nullable=True)
+    full_name: Mapped[str | None] = mapped_column(
+        String, Computed("first_name || ' ' || last_name", persisted=True)
+    )
     owner_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=True
     )
@@ -21,3 +27,5 @@ class Contact(Base):
     owner: Mapped["User"] = relationship(
         "User", back_populates="contacts", lazy="selectin"
     )
+
+    __table_args__ = (Index("ix_contacts_owner_full_name", "owner_id", "full_name"),)
@@ -1,10 +1,113 @@
-from datetime import datetime, timedelta
+import warnings
+from datetime import date, datetime, timedelta
 from typing import List
-from sqlalchemy import extract, or_, select, update
+from sqlalchemy import (
+    Boolean,
+    Integer,
+    and_,
+    bindparam,
+    String,
+    cast,
+    delete,
+    extract,
+    func,
+    insert,
+    lambda_stmt,
+    literal_column,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
 
 from src.contacts.models import Contact
 from src.contacts.schemas import ContactsCreate
 
+_SPACE = literal_column("' '", String)
+# Must match the ix_contacts_search_trgm expression index so the planner can use it.
+_SEARCH_DOCUMENT = (
+    func.lower(Contact.first_name, type_=String)
+    + _SPACE
+    + func.lower(Contact.last_name, type_=String)
+    + _SPACE
+    + func.lower(Contact.email, type_=String)
+)
+# Generated tsvector column backed by the ix_contacts_search_tsv GIN index.
+_SEARCH_TSV_MATCH = "contacts.search_tsv @@ plainto_tsquery('simple', :q)"
+# List queries eagerly load the owner needed by ContactsResponse in one extra
+# SELECT and refuse any other lazy load, so serialization cannot go N+1.
+_LIST_LOAD_OPTIONS = (selectinload(Contact.owner), raiseload("*"))
+# Built once so the hot by-id lookups reuse the same statement and its cached compiled form per call.
+_GET_BY_ID = select(Contact).where(Contact.id == bindparam("contact_id"))
+_GET_BY_ID_AND_OWNER = select(Contact).where(
+    Contact.owner_id == bindparam("owner_id"), Contact.id == bindparam("contact_id")
+)
+# Must match the ix_contacts_owner_birthday_month_day expression index. Comparing month and day as MMDD
+# keeps birthdays on the same calendar day whatever the birth year's leap status.
+_BIRTHDAY_MONTH = cast(extract("month", Contact.birthday), Integer)
+_BIRTHDAY_DAY = cast(extract("day", Contact.birthday), Integer)
+_BIRTHDAY_MONTH_DAY = _BIRTHDAY_MONTH * literal_column("100", Integer) + _BIRTHDAY_DAY
+_WINDOW_START = bindparam("start_month_day", type_=Integer)
+_WINDOW_END = bindparam("end_month_day", type_=Integer)
+_WINDOW_WRAPPED = bindparam("wrapped", type_=Boolean)
+# One statement for every window: a window that runs past December 31 sets wrapped and matches the rest
+# of this year or the start of the next one, so the plan does not change near year-end.
+_UPCOMING_BIRTHDAYS = (
+    select(Contact)
+    .where(
+        Contact.owner_id == bindparam("owner_id"),
+        or_(
+            and_(
+                _BIRTHDAY_MONTH_DAY >= _WINDOW_START, _BIRTHDAY_MONTH_DAY <= _WINDOW_END
+            ),
+            and_(
+                _WINDOW_WRAPPED,
+                or_(
+                    _BIRTHDAY_MONTH_DAY >= _WINDOW_START,
+                    _BIRTHDAY_MONTH_DAY <= _WINDOW_END,
+                ),
+            ),
+        ),
+    )
+    .options(*_LIST_LOAD_OPTIONS)
+)
+
+
+def _month_day(day: date) -> int:
+    return day.month * 100 + day.day
+
+
+def _paginate(query, limit: int, offset: int, after_id: int | None):
+    """
+    Applies keyset pagination to a contacts lambda statement, falling back to OFFSET.
+
+    Each bound is appended as its own lambda, so every pagination shape is compiled once and the limit,
+    offset and after_id values are bound as parameters on later calls.
+
+    Parameters:
+    query (StatementLambdaElement): The query to paginate.
+    limit (int): The maximum number of contacts to return.
+    offset (int): The legacy number of contacts to skip; ignored when after_id is given.
+    after_id (int | None): Return only contacts with an id greater than this one.
+
+    Returns:
+    StatementLambdaElement: The query ordered by Contact.id with the page bounds applied.
+    """
+    query += lambda q: q.order_by(Contact.id).limit(limit)
+    if after_id is not None:
+        query += lambda q: q.where(Contact.id > after_id)
+        return query
+    if offset:
+        warnings.warn(
+            "offset pagination is deprecated, pass after_id instead",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        query += lambda q: q.offset(offset)
+    return query
+
 
 class ContactsRepository:
     def __init__(self, session):
@@ -12,7 +115,8 @@ class ContactsRepository:
         Initialize a new instance of ContactsRepository.
 
         This class provides methods for interacting with the Contacts database table.
-        It uses SQLAlchemy ORM to perform database operations.
+        It uses SQLAlchemy ORM to perform database operations. Routers build one repository per request,
+        so the find_contact cache lives exactly as long as the request.
 
         Parameters:
         session (Session): A SQLAlchemy session object for database interaction.
@@ -21,49 +125,59 @@ class ContactsRepository:
         None
         """
         self.session = session
-
-    def get_contacts(self, owner_id, limit: int = 10, offset: int = 0) -> List[Contact]:
+        self._cache: dict[tuple[int, str], Contact] = {}
+
+    def get_contacts(
+        self,
+        owner_id,
+        limit: int = 10,
+        offset: int = 0,
+        after_id: int | None = None,
+    ) -> List[Contact]:
         """
         Retrieves a list of contacts for the specified owner from the database with pagination support.
 
-        This function constructs a SQLAlchemy query to select contacts from the Contacts table where the owner_id
-        matches the provided owner_id. The query includes pagination support, allowing retrieval of a specified number
-        of contacts at a time, starting from a given offset.
+        This function builds a cached lambda statement that selects contacts from the Contacts table where the owner_id
+        matches the provided owner_id, so the query is compiled once per pagination shape. Pages are ordered by id;
+        pass the last id of the previous page as after_id to fetch the next one with an index seek instead of an
+        OFFSET scan.
 
         Parameters:
         owner_id (int): The ID of the owner for whom to retrieve contacts.
         limit (int): The maximum number of contacts to retrieve per page. Default is 10.
-        offset (int): The number of contacts to skip before starting to retrieve. Default is 0.
+        offset (int): Deprecated. The number of contacts to skip before starting to retrieve. Default is 0.
+        after_id (int | None): The id of the last contact of the previous page. Default is None.
 
         Returns:
         List[Contact]: A list of Contact objects retrieved from the database.
         """
-        query = (
-            select(Contact)
+        query = lambda_stmt(
+            lambda: select(Contact)
             .where(Contact.owner_id == owner_id)
-            .limit(limit)
-            .offset(offset)
+            .options(*_LIST_LOAD_OPTIONS)
         )
-        results = self.session.execute(query)
-        return results.scalars().all()
+        return self.session.scalars(_paginate(query, limit, offset, after_id)).all()
 
-    def get_contacts_all(self, limit: int = 10, offset: int = 0) -> List[Contact]:
+    def get_contacts_all(
+        self, limit: int = 10, offset: int = 0, after_id: int | None = None
+    ) -> List[Contact]:
         """
         Retrieve all contacts from the database with pagination support.
 
-        This function retrieves a list of contacts from the database based on the provided limit and offset.
+        This function retrieves a page of contacts ordered by id, starting after the provided after_id, through the
+        same cached lambda statement pagination as get_contacts.
         It uses SQLAlchemy ORM to execute the query and returns a list of Contact objects.
 
         Parameters:
         limit (int): The maximum number of contacts to retrieve per page. Default is 10.
-        offset (int): The number of contacts to skip before starting to retrieve. Default is 0.
+        offset (int): Deprecated. The number of contacts to skip before starting to retrieve. Default is 0.
+        after_id (int | None): The id of the last contact of the previous page. Default is None.
 
         Returns:
         List[Contact]: A list of Contact objects retrieved from the database.
         """
-        query = select(Contact).limit(limit).offset(offset)
-        results = self.session.execute(query)
-        return results.scalars().all()
+        query = lambda_stmt(lambda: select(Contact).options(*_LIST_LOAD_OPTIONS))
+        return self.session.scalars(_paginate(query, limit, offset, after_id)).all()
 
     def create_contacts(self, contact: ContactsCreate, owner_id: int) -> Contact:
         """
@@ -86,13 +200,48 @@ class ContactsRepository:
         self.session.refresh(new_contact)
         return new_contact
 
+    def create_contacts_bulk(
+        self, contacts: List[ContactsCreate], owner_id: int
+    ) -> List[int]:
+        """
+        Creates several contacts for the specified owner in a single INSERT and a single commit.
+
+        The rows are sent as one executemany-style INSERT ... RETURNING statement, and the new contacts are not
+        refreshed, so an import costs one round-trip and one commit however many rows it holds.
+
+        Parameters:
+        contacts (List[ContactsCreate]): The contacts to create.
+        owner_id (int): The ID of the owner for whom the contacts are being created.
+
+        Returns:
+        List[int]: The IDs of the created contacts, in input order.
+
+        Raises:
+        ValueError: If one of the emails is already used by another contact.
+        """
+        if not contacts:
+            return []
+        rows = [contact.model_dump() | {"owner_id": owner_id} for contact in contacts]
+        try:
+            contact_ids = self.session.scalars(
+                insert(Contact).returning(Contact.id, sort_by_parameter_order=True),
+                rows,
+            ).all()
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise ValueError("Email already in use")
+        return contact_ids
+
     def search_contacts(self, owner_id, query):
         """
         Search for contacts based on the given owner_id and query.
 
         This function performs a case-insensitive search on the first_name, last_name, and email fields
-        of the Contacts database table for the specified owner_id. The search is performed using the
-        provided query string.
+        of the Contacts database table for the specified owner_id. Multi-word queries are matched word by word
+        against the full-text search_tsv column, so the words may appear in any field and order.
+        Single-word queries fall back to a substring match on a single lowercased expression that is backed
+        by a pg_trgm GIN index. Both paths are index lookups rather than sequential scans.
 
         Parameters:
         owner_id (int): The ID of the owner for whom to search contacts.
@@ -101,25 +250,23 @@ class ContactsRepository:
         Returns:
         List[Contact]: A list of Contact objects that match the search criteria.
         """
+        if len(query.split()) > 1:
+            condition = text(_SEARCH_TSV_MATCH).bindparams(q=query)
+        else:
+            condition = _SEARCH_DOCUMENT.like(f"%{query.strip().lower()}%")
         q = (
             select(Contact)
-            .where(Contact.owner_id == owner_id)
-            .filter(
-                (Contact.first_name.ilike(f"%{query}%"))
-                | (Contact.last_name.ilike(f"%{query}%"))
-                | (Contact.email.ilike(f"%{query}%"))
-            )
+            .where(Contact.owner_id == owner_id, condition)
+            .options(*_LIST_LOAD_OPTIONS)
         )
-        results = self.session.execute(q)
-        return results.scalars().all()
+        return self.session.scalars(q).all()
 
     def get_contact_by_id_and_owner(self, owner_id: int, contact_id: int) -> Contact:
         """
         Retrieve a contact from the database based on the provided owner_id and contact_id.
 
-        This function constructs a SQLAlchemy query to select a single contact from the Contacts table
-        where the owner_id matches the provided owner_id and the contact_id matches the provided contact_id.
-        The query is executed using the provided SQLAlchemy session and the result is returned.
+        This function runs the prebuilt _GET_BY_ID_AND_OWNER statement, which selects a single contact
+        whose owner_id and id match the provided values, and returns the result.
 
         Parameters:
         owner_id (int): The ID of the owner for whom to retrieve the contact.
@@ -128,19 +275,16 @@ class ContactsRepository:
         Returns:
         Contact: The contact object with the matching owner_id and contact_id, or None if no such contact exists.
         """
-        q = select(Contact).where(
-            Contact.owner_id == owner_id, Contact.id == contact_id
+        return self.session.scalar(
+            _GET_BY_ID_AND_OWNER, {"owner_id": owner_id, "contact_id": contact_id}
         )
-        result = self.session.execute(q)
-        return result.scalar_one_or_none()
 
     def get_contact_by_id(self, contact_id: int) -> Contact:
         """
         Retrieve a contact from the database based on the provided contact_id.
 
-        This function constructs a SQLAlchemy query to select a single contact from the Contacts table
-        where the contact_id matches the provided contact_id. The query is executed using the provided
-        SQLAlchemy session and the result is returned.
+        This function runs the prebuilt _GET_BY_ID statement, which selects a single contact whose id
+        matches the provided contact_id, and returns the result.
 
         Parameters:
         contact_id (int): The ID of the contact to retrieve.
@@ -148,9 +292,7 @@ class ContactsRepository:
         Returns:
         Contact: The contact object with the matching contact_id, or None if no such contact exists.
         """
-        query = select(Contact).where(Contact.id == contact_id)
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+        return self.session.scalar(_GET_BY_ID, {"contact_id": contact_id})
 
     def delete_contact(self, contact_id: int):
         """
@@ -169,14 +311,34 @@ class ContactsRepository:
         if contact:
             self.session.delete(contact)
             self.session.commit()
+            self._cache.clear()
+
+    def delete_contact_returning(self, contact_id: int) -> int | None:
+        """
+        Deletes a contact from the database in a single DELETE ... RETURNING statement.
+
+        Parameters:
+        contact_id (int): The ID of the contact to delete.
+
+        Returns:
+        int | None: The ID of the deleted contact, or None if no contact with the given ID exists.
+        """
+        deleted_id = self.session.scalar(
+            delete(Contact).where(Contact.id == contact_id).returning(Contact.id)
+        )
+        self.session.commit()
+        self._cache.clear()
+        return deleted_id
 
     def get_upcoming_birthdays(self, owner_id: int, days: int = 7) -> List[Contact]:
         """
         Retrieves a list of contacts who have birthdays within the specified number of days from today.
 
-        This function calculates the upcoming birthdays based on the current date and the provided number of days.
-        It then constructs a SQLAlchemy query to select contacts from the database where the owner_id matches the provided
-        owner_id and the contact's birthday falls within the specified range.
+        This function compares each birthday's month and day, as an MMDD number, with the first and last day of
+        the window, so a birthday falls on the same calendar day whatever the birth year's leap status. Every window runs
+        the prebuilt _UPCOMING_BIRTHDAYS statement; windows that run past December 31 only set its wrapped
+        parameter. A February 29 birthday is included in a non-leap year when the window
+        spans February 28 to March 1.
 
         Parameters:
         owner_id (int): The ID of the owner for whom to retrieve upcoming birthdays.
@@ -185,37 +347,25 @@ class ContactsRepository:
         Returns:
         List[Contact]: A list of Contact objects who have birthdays within the specified number of days from today.
         """
-        today = datetime.today()
-        upcoming_date = today + timedelta(days=days)
-        today_day_of_year = today.timetuple().tm_yday
-        upcoming_day_of_year = upcoming_date.timetuple().tm_yday
-
-        if today_day_of_year <= upcoming_day_of_year:
-            query = select(Contact).filter(
-                Contact.owner_id == owner_id,
-                extract("doy", Contact.birthday).between(
-                    today_day_of_year, upcoming_day_of_year
-                ),
-            )
-        else:
-            query = select(Contact).filter(
-                Contact.owner_id == owner_id,
-                or_(
-                    extract("doy", Contact.birthday) >= today_day_of_year,
-                    extract("doy", Contact.birthday) <= upcoming_day_of_year,
-                ),
-            )
-
-        results = self.session.execute(query)
-        return results.scalars().all()
+        today = datetime.today().date()
+        end = today + timedelta(days=days)
+        params = {
+            "owner_id": owner_id,
+            "start_month_day": _month_day(today),
+            "end_month_day": _month_day(end),
+            "wrapped": end.year != today.year,
+        }
+        return self.session.scalars(_UPCOMING_BIRTHDAYS, params).all()
 
     def find_contact(self, owner_id: int, identifier: str) -> Contact:
         """
         Finds a contact in the database based on the provided owner_id and identifier.
 
-        The function attempts to convert the identifier to an integer and uses it to search for a contact by ID.
-        If the conversion fails, it treats the identifier as a string and performs a search based on email,
-        first name, or full name (first name + last name).
+        The identifier's shape picks a single indexed predicate: ASCII digits match the contact ID, a value containing
+        "@" matches the email, a value containing a space matches the generated full_name column and anything else
+        matches the first name. If that probe finds nothing, the original match on any of the four columns is
+        used as a fallback, so ambiguous values such as a numeric or two-word first name still resolve.
+        Found contacts are cached on the repository until the next update or delete.
 
         Parameters:
         owner_id (int): The ID of the owner for whom to find the contact.
@@ -225,22 +375,38 @@ class ContactsRepository:
         Returns:
         Contact: The contact object with the matching owner_id and identifier, or None if no such contact exists.
         """
-        try:
-            contact_id = int(identifier)
-        except ValueError:
-            contact_id = None
+        identifier = str(identifier)
+        key = (owner_id, identifier)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        # isdigit() also accepts characters such as "²" that int() rejects, so only plain ASCII decimals are ids.
+        contact_id = (
+            int(identifier) if identifier.isascii() and identifier.isdecimal() else None
+        )
+        if contact_id is not None:
+            predicate = Contact.id == contact_id
+        elif "@" in identifier:
+            predicate = Contact.email == identifier
+        elif " " in identifier:
+            predicate = Contact.full_name == identifier
+        else:
+            predicate = Contact.first_name == identifier
 
-        query = select(Contact).where(
-            Contact.owner_id == owner_id,
-            or_(
+        owned = Contact.owner_id == owner_id
+        contact = self.session.scalar(select(Contact).where(owned, predicate))
+        if contact is None:
+            fallback = or_(
                 Contact.id == contact_id,
                 Contact.email == identifier,
                 Contact.first_name == identifier,
-                (Contact.first_name + " " + Contact.last_name) == identifier,
-            ),
-        )
-        result = self.session.execute(query)
-        return result.scalar_one_or_none()
+                Contact.full_name == identifier,
+            )
+            contact = self.session.scalar(select(Contact).where(owned, fallback))
+        if contact is not None:
+            self._cache[key] = contact
+        return contact
 
     def update_contact(
         self, identifier: str, owner_id: int, contact_update: ContactsCreate
@@ -249,9 +415,9 @@ class ContactsRepository:
         Updates a contact in the database based on the provided identifier and owner_id.
 
         This function first finds the contact using the provided identifier and owner_id.
-        If the contact is found, it checks if the email in the contact_update object is unique among all contacts.
-        If the email is unique, it updates the contact's information using the provided contact_update object.
-        The updated contact is then committed to the database and returned.
+        If the contact is found, it updates the contact's information using the provided contact_update object
+        in a single UPDATE ... RETURNING statement. Email uniqueness is enforced by the unique index on
+        contacts.email, so no separate lookup is needed. The updated contact is then committed and returned.
 
         Parameters:
         identifier (str): The identifier to search for. This can be a contact ID (converted to int), email, first name, or full name.
@@ -260,25 +426,26 @@ class ContactsRepository:
 
         Returns:
         Contact: The updated contact object, or None if no contact is found with the provided identifier and owner_id.
+
+        Raises:
+        ValueError: If the new email is already used by another contact.
         """
         contact = self.find_contact(owner_id, identifier)
         if not contact:
             return None
 
-        if contact_update.email:
-            existing_contact = self.session.execute(
-                select(Contact).where(Contact.email == contact_update.email)
-            ).scalar_one_or_none()
-            if existing_contact and existing_contact.id != contact.id:
-                raise ValueError("Email already in use")
-
         stmt = (
             update(Contact)
             .where(Contact.id == contact.id)
             .values(contact_update.model_dump(exclude_unset=True))
             .returning(Contact)
         )
-        result = self.session.execute(stmt)
-        self.session.commit()
-        updated_contact = result.scalar()
+        try:
+            updated_contact = self.session.scalar(stmt)
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise ValueError("Email already in use")
+        finally:
+            self._cache.clear()
         return updated_contact
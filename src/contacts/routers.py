@@ -1,16 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from fastapi_limiter.depends import RateLimiter
+from starlette.concurrency import run_in_threadpool
 
 from src.auth.schemas import RoleEnum
 from src.auth.models import User
 from src.auth.utils import RoleChecker, get_current_user
 from config.db import get_db
+from src.contacts import cache
 from src.contacts.repo import ContactsRepository
 from src.contacts.schemas import ContactsCreate, ContactsResponse
 
 router = APIRouter()
 
+NEXT_PAGE_HEADER = "X-Next-After-Id"
+# Caps one bulk INSERT well below the drivers' bind-parameter limits (7 parameters per contact).
+BULK_CREATE_LIMIT = 100
+_CONTACTS_ADAPTER = TypeAdapter(list[ContactsResponse])
+
+
+def get_repo(db: Session = Depends(get_db)) -> ContactsRepository:
+    """
+    Provides a ContactsRepository bound to the request's database session.
+
+    Parameters:
+    db (Session): The database session. Defaults to Depends(get_db).
+
+    Returns:
+    ContactsRepository: The repository for the current request.
+    """
+    return ContactsRepository(db)
+
+
+def _next_cursor(contacts: list, limit: int) -> str | None:
+    """
+    Returns the keyset cursor for the next page when the current page is full.
+
+    Parameters:
+    contacts (list): The contacts returned for the current page.
+    limit (int): The requested page size.
+
+    Returns:
+    str | None: The id of the last contact, or None when there is no next page.
+    """
+    if contacts and len(contacts) == limit:
+        return str(contacts[-1].id)
+    return None
+
+
+def _dump_contacts(contacts: list) -> bytes:
+    """
+    Serializes contacts to the JSON body of a list[ContactsResponse] response.
+
+    Parameters:
+    contacts (list): The Contact objects to serialize.
+
+    Returns:
+    bytes: The JSON-encoded response body.
+    """
+    return _CONTACTS_ADAPTER.dump_json(
+        _CONTACTS_ADAPTER.validate_python(contacts, from_attributes=True)
+    )
+
+
+def _as_response(write, *args) -> ContactsResponse | None:
+    """
+    Runs a repository write and serializes the contact it returns in the same worker thread.
+
+    The write's commit expires the contact, so serializing it on the event loop would reload it there.
+
+    Parameters:
+    write (Callable): The repository method that creates or updates a contact.
+    args: The arguments passed to write.
+
+    Returns:
+    ContactsResponse | None: The serialized contact, or None if write found no contact.
+    """
+    contact = write(*args)
+    if contact is None:
+        return None
+    return ContactsResponse.model_validate(contact, from_attributes=True)
+
+
+def _json_response(body: bytes, cursor: str | None = None) -> Response:
+    """
+    Wraps a serialized contacts list in a JSON response carrying the next-page cursor.
+
+    Parameters:
+    body (bytes): The JSON-encoded response body.
+    cursor (str | None): The next-page cursor for the X-Next-After-Id header. Default is None.
+
+    Returns:
+    Response: The response to return from the route.
+    """
+    headers = {NEXT_PAGE_HEADER: cursor} if cursor else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/ping")
 def hello() -> dict:
@@ -35,10 +121,10 @@ def hello() -> dict:
     ],
     status_code=status.HTTP_201_CREATED,
 )
-def create_contacts(
+async def create_contacts(
     contact: ContactsCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    repo: ContactsRepository = Depends(get_repo),
 ):
     """
     Creates a new contact in the database.
@@ -46,7 +132,7 @@ def create_contacts(
     Parameters:
     contact (ContactsCreate): The contact data to be created.
     current_user (User, optional): The current user making the request. Defaults to Depends(get_current_user).
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
 
     Returns:
     ContactsResponse: The newly created contact.
@@ -54,8 +140,52 @@ def create_contacts(
     Raises:
     HTTPException: If the current user does not have the required role.
     """
-    repo = ContactsRepository(db)
-    return repo.create_contacts(contact, current_user.id)
+    # The commit expires current_user, so its id is read before the write.
+    owner_id = current_user.id
+    new_contact = await run_in_threadpool(
+        _as_response, repo.create_contacts, contact, owner_id
+    )
+    await cache.invalidate(owner_id)
+    return new_contact
+
+
+@router.post(
+    "/bulk",
+    response_model=list[int],
+    dependencies=[
+        Depends(RoleChecker([RoleEnum.USER, RoleEnum.ADMIN])),
+        Depends(RateLimiter(times=10, seconds=60)),
+    ],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_contacts_bulk(
+    contacts: list[ContactsCreate] = Body(..., max_length=BULK_CREATE_LIMIT),
+    current_user: User = Depends(get_current_user),
+    repo: ContactsRepository = Depends(get_repo),
+) -> list[int]:
+    """
+    Creates several contacts in the database with a single insert and commit.
+
+    Parameters:
+    contacts (list[ContactsCreate]): The contacts to be created, at most BULK_CREATE_LIMIT per request.
+    current_user (User, optional): The current user making the request. Defaults to Depends(get_current_user).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
+
+    Returns:
+    list[int]: The IDs of the newly created contacts, in request order.
+
+    Raises:
+    HTTPException: If one of the emails is already used by another contact.
+    """
+    owner_id = current_user.id
+    try:
+        contact_ids = await run_in_threadpool(
+            repo.create_contacts_bulk, contacts, owner_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    await cache.invalidate(owner_id)
+    return contact_ids
 
 
 @router.get(
@@ -66,26 +196,41 @@ def create_contacts(
         Depends(RateLimiter(times=10, seconds=60)),
     ],
 )
-def get_contacts(
+async def get_contacts(
     limit: int = 10,
     offset: int = 0,
+    after_id: int | None = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    repo: ContactsRepository = Depends(get_repo),
 ) -> list[ContactsResponse]:
     """
     Retrieves a list of contacts from the database based on the current user's role and pagination parameters.
 
+    When the page is full, the id to pass as after_id for the next page is returned in the X-Next-After-Id header.
+    Pages are cached in Redis per user for settings.contacts_cache_ttl seconds and dropped on any write.
+
     Parameters:
     limit (int, optional): The maximum number of contacts to retrieve. Defaults to 10.
-    offset (int, optional): The number of contacts to skip before starting to retrieve. Defaults to 0.
+    offset (int, optional): Deprecated. The number of contacts to skip before starting to retrieve. Defaults to 0.
+    after_id (int, optional): The id of the last contact of the previous page. Defaults to None.
     current_user (User, optional): The current user making the request. Defaults to Depends(get_current_user).
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
 
     Returns:
     list[ContactsResponse]: A list of retrieved contacts.
     """
-    repo = ContactsRepository(db)
-    return repo.get_contacts(current_user.id, limit, offset)
+    key = cache.cache_key(current_user.id, "list", limit, offset, after_id)
+    cached = await cache.get_cached(key)
+    if cached is not None:
+        return _json_response(*cached)
+
+    contacts = await run_in_threadpool(
+        repo.get_contacts, current_user.id, limit, offset, after_id
+    )
+    body = _dump_contacts(contacts)
+    cursor = _next_cursor(contacts, limit)
+    await cache.set_cached(key, body, cursor)
+    return _json_response(body, cursor)
 
 
 @router.get(
@@ -98,23 +243,32 @@ def get_contacts(
     tags=["admin"],
 )
 def get_contacts_all(
+    response: Response,
     limit: int = 10,
     offset: int = 0,
-    db: Session = Depends(get_db),
+    after_id: int | None = None,
+    repo: ContactsRepository = Depends(get_repo),
 ) -> list[ContactsResponse]:
     """
     Retrieves all contacts from the database for admin users.
 
+    When the page is full, the id to pass as after_id for the next page is returned in the X-Next-After-Id header.
+
     Parameters:
+    response (Response): The outgoing response, used to set the next-page header.
     limit (int, optional): The maximum number of contacts to retrieve. Defaults to 10.
-    offset (int, optional): The number of contacts to skip before starting to retrieve. Defaults to 0.
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    offset (int, optional): Deprecated. The number of contacts to skip before starting to retrieve. Defaults to 0.
+    after_id (int, optional): The id of the last contact of the previous page. Defaults to None.
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
 
     Returns:
     list[ContactsResponse]: A list of retrieved contacts.
     """
-    repo = ContactsRepository(db)
-    return repo.get_contacts_all(limit, offset)
+    contacts = repo.get_contacts_all(limit, offset, after_id)
+    cursor = _next_cursor(contacts, limit)
+    if cursor:
+        response.headers[NEXT_PAGE_HEADER] = cursor
+    return contacts
 
 
 @router.get(
@@ -128,7 +282,7 @@ def get_contacts_all(
 def search_contacts(
     query: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    repo: ContactsRepository = Depends(get_repo),
 ) -> list[ContactsResponse]:
     """
     This function searches for contacts based on a given query.
@@ -136,26 +290,25 @@ def search_contacts(
     Parameters:
     query (str): The search query string.
     current_user (User, optional): The current user making the request. Defaults to Depends(get_current_user).
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
 
     Returns:
     list[ContactsResponse]: A list of contacts that match the search query.
     """
-    repo = ContactsRepository(db)
     return repo.search_contacts(current_user.id, query)
 
 
 @router.delete("/{contact_id}", dependencies=[Depends(RoleChecker([RoleEnum.ADMIN]))])
-def delete_contact(
+async def delete_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
+    repo: ContactsRepository = Depends(get_repo),
 ) -> dict:
     """
     Deletes a contact from the database based on the provided contact ID.
 
     Parameters:
     contact_id (int): The unique identifier of the contact to be deleted.
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
 
     Returns:
     dict: A confirmation message indicating the successful deletion of the contact.
@@ -163,43 +316,54 @@ def delete_contact(
     Raises:
     HTTPException: If the contact with the given ID is not found in the database.
     """
-    repo = ContactsRepository(db)
-    contact = repo.get_contact_by_id(contact_id)
-    if not contact:
+    deleted_id = await run_in_threadpool(repo.delete_contact_returning, contact_id)
+    if deleted_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
-    repo.delete_contact(contact_id)
+    # Admins delete by id, so the owner is unknown here; drop every cached page.
+    await cache.invalidate()
     return {"message": f"Contact {contact_id} deleted"}
 
 
 @router.get("/upcoming_birthdays/")
-def get_upcoming_birthdays(
+async def get_upcoming_birthdays(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    repo: ContactsRepository = Depends(get_repo),
     days: int = 7,
 ) -> list[ContactsResponse]:
     """
     Retrieves a list of upcoming birthdays for the current user's contacts.
 
+    Results are cached in Redis per user for settings.contacts_cache_ttl seconds and dropped on any write.
+
     Parameters:
     current_user (User, optional): The current user making the request. Defaults to Depends(get_current_user).
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
     days (int, optional): The number of days in the future to consider for upcoming birthdays. Defaults to 7.
 
     Returns:
     list[ContactsResponse]: A list of contacts with upcoming birthdays. Each contact is represented by a ContactsResponse object.
     """
-    repo = ContactsRepository(db)
-    return repo.get_upcoming_birthdays(current_user.id, days)
+    key = cache.cache_key(current_user.id, "birthdays", days)
+    cached = await cache.get_cached(key)
+    if cached is not None:
+        return _json_response(*cached)
+
+    contacts = await run_in_threadpool(
+        repo.get_upcoming_birthdays, current_user.id, days
+    )
+    body = _dump_contacts(contacts)
+    await cache.set_cached(key, body)
+    return _json_response(body)
 
 
 @router.put("/{identifier}", response_model=ContactsResponse)
-def update_contact(
+async def update_contact(
     identifier: str,
     contact_update: ContactsCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    repo: ContactsRepository = Depends(get_repo),
 ):
     """
     Updates an existing contact in the database based on the provided identifier.
@@ -208,17 +372,24 @@ def update_contact(
     identifier (str): The unique identifier of the contact to be updated.
     contact_update (ContactsCreate): The updated contact data.
     current_user (User, optional): The current user making the request. Defaults to Depends(get_current_user).
-    db (Session, optional): The database session. Defaults to Depends(get_db).
+    repo (ContactsRepository, optional): The contacts repository for this request. Defaults to Depends(get_repo).
 
     Returns:
     ContactsResponse: The updated contact.
 
     Raises:
-    HTTPException: If the contact with the given identifier is not found in the database.
+    HTTPException: If the contact with the given identifier is not found in the database,
+    or 409 if the new email is already used by another contact.
     """
-    repo = ContactsRepository(db)
-    updated_contact = repo.update_contact(identifier, current_user.id, contact_update)
+    owner_id = current_user.id
+    try:
+        updated_contact = await run_in_threadpool(
+            _as_response, repo.update_contact, identifier, owner_id, contact_update
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if updated_contact:
+        await cache.invalidate(owner_id)
         return updated_contact
     else:
         raise HTTPException(status_code=404, detail="Contact not found")
@@ -1,9 +1,10 @@
+import logging
 from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
 import jwt
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from datetime import date
+from sqlalchemy import insert
 from src.auth.utils import (
     ALGORITHM,
     SECRET_KEY,
@@ -11,41 +12,105 @@ from src.auth.utils import (
     create_refresh_token,
 )
 from src.auth.pass_utils import get_password_hash
+from src.auth.repo import _ROLE_CACHE
 from src.auth.schemas import RoleEnum
 from config.db import Base, get_db
+from config.general import settings
 from main import app
 from src.auth.models import User, Role
+from src.contacts import cache
 from src.contacts.models import Contact
+from tests.database import TestingSessionLocal, engine
 import os
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def pytest_configure(config):
+    # Faker logs every provider lookup at DEBUG; silence it once for the whole run.
+    logging.getLogger("faker.factory").setLevel(logging.ERROR)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session", autouse=True)
+def statement_cache_supported():
+    # Without dialect support every statement is recompiled, which hides cache regressions.
+    if not engine.dialect.supports_statement_cache:
+        pytest.fail(
+            f"{engine.dialect.name} dialect does not support the SQLAlchemy statement cache"
+        )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing():
+    # 4 is bcrypt's minimum cost; hashes made with it still verify through the normal path.
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+        yield
+
+
+@pytest.fixture(scope="session")
 def client():
-    return TestClient(app)
+    # One client for the whole run, so the app's startup and shutdown happen only once.
+    with TestClient(app) as client:
+        yield client
 
 
-@pytest.fixture(scope="module")
-def setup_db():
+@pytest.fixture(scope="function")
+def clear_contacts_cache(client):
+    # Test rows are rolled back and their ids reused, so cached pages must not outlive the test.
+    yield
+    client.portal.call(cache.invalidate)
+
+
+@pytest.fixture(scope="session")
+def db_schema():
+    # The schema is created once per run; modules and tests only open transactions on it.
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="module")
+def setup_db(db_schema):
+    # One outer transaction per module; rolling it back discards the module's data.
+    connection = engine.connect()
+    transaction = connection.begin()
+    yield connection
+    transaction.rollback()
+    connection.close()
+    _ROLE_CACHE.clear()
+
+
 @pytest.fixture(scope="function")
 def db_session(setup_db):
-    session = TestingSessionLocal()
+    # Each test runs in its own SAVEPOINT. Session commits only release a nested SAVEPOINT inside it,
+    # so rolling the test's SAVEPOINT back also discards rows that fixtures committed.
+    test_savepoint = setup_db.begin_nested()
+    session = TestingSessionLocal(
+        bind=setup_db, join_transaction_mode="create_savepoint"
+    )
     try:
         yield session
-        session.rollback()
     finally:
         session.close()
+        if test_savepoint.is_active:
+            test_savepoint.rollback()
+
+
+@pytest.fixture(scope="module")
+def shared_get_db(setup_db):
+    # Routes get a fresh session per request on the module connection, so they see the module's seed rows
+    # and the rows a test's fixtures flushed, and their commits stay inside the test's SAVEPOINT.
+    def _get_db():
+        session = TestingSessionLocal(
+            bind=setup_db, join_transaction_mode="create_savepoint"
+        )
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = _get_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.fixture(scope="function")
@@ -58,11 +123,17 @@ def override_get_db(db_session):
     app.dependency_overrides.clear()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def user_password():
     return "test_password"
 
 
+@pytest.fixture(scope="session")
+def hashed_test_password(user_password, fast_password_hashing):
+    # Hash the shared test password only once, at the reduced test cost.
+    return get_password_hash(user_password)
+
+
 @pytest.fixture(scope="function")
 def user_role(db_session):
     role = db_session.query(Role).filter_by(name=RoleEnum.USER.value).first()
@@ -74,16 +145,13 @@ def user_role(db_session):
 
 
 @pytest.fixture(scope="function")
-def test_user(db_session, user_password, user_role):
-    # Хэшируем пароль пользователя
-    hashed_password = get_password_hash(user_password)
-
+def test_user(db_session, hashed_test_password, user_role):
     # Создаем нового пользователя
     new_user = User(
         username="test_user",
         email="test_user@example.com",
         is_active=True,
-        hashed_password=hashed_password,
+        hashed_password=hashed_test_password,
         role_id=user_role.id,
     )
 
@@ -113,37 +181,96 @@ def mock_rate_limiter():
 
 @pytest.fixture(scope="function")
 def auth_headers(test_user):
-    access_token = create_access_token(data={"sub": test_user.username})
-    refresh_token = create_refresh_token(data={"sub": test_user.username})
+    # get_current_user looks users up by email, so that is the token subject.
+    user = test_user["user"]
+    access_token = create_access_token(data={"sub": user.email})
+    refresh_token = create_refresh_token(data={"sub": user.email})
 
     headers = {
         "Authorization": f"Bearer {access_token}",
         "X-Refresh-Token": refresh_token,
         "Content-Type": "application/json",
     }
-    print(f"Access token1: {access_token}, {test_user.username}")
-    print(f"Refresh token1: {refresh_token}, {test_user.email}")
+    print(f"Access token1: {access_token}, {user.username}")
+    print(f"Refresh token1: {refresh_token}, {user.email}")
 
     return headers
 
 
 @pytest.fixture(scope="function")
 def test_user_contact(db_session, test_user):
-
+    # For tests that change the contact: it is only flushed, so teardown rolls it back.
     contact = Contact(
         first_name="John",
         last_name="Doe",
         email="john.doe@example.com",
         phone_number="123456789",
-        birthday="1990-01-01",
-        user_id=test_user.id,
+        birthday=date(1990, 1, 1),
+        owner_id=test_user["user"].id,
     )
     db_session.add(contact)
-    db_session.commit()
-    db_session.refresh(contact)
+    db_session.flush()
     return contact
 
 
+@pytest.fixture(scope="module")
+def shared_roles(setup_db):
+    # Both roles exist for the whole module, so the seeded users pass RoleChecker.
+    rows = setup_db.execute(
+        insert(Role).returning(Role.name, Role.id),
+        [{"name": role.value} for role in RoleEnum],
+    ).all()
+    return {RoleEnum(name): role_id for name, role_id in rows}
+
+
+def _insert_shared_user(connection, name: str, role_id: int) -> int:
+    return connection.execute(
+        insert(User)
+        .values(
+            username=name,
+            email=f"{name}@example.com",
+            hashed_password="not-a-real-hash",
+            is_active=True,
+            role_id=role_id,
+        )
+        .returning(User.id)
+    ).scalar_one()
+
+
+@pytest.fixture(scope="module")
+def shared_contacts(setup_db, shared_roles):
+    # Read-only seed data, inserted once per module with a single batched INSERT.
+    owner_id = _insert_shared_user(
+        setup_db, "shared_owner", shared_roles[RoleEnum.USER]
+    )
+    rows = [
+        {
+            "first_name": "Shared",
+            "last_name": f"Contact{i}",
+            "email": f"shared.contact{i}@example.com",
+            "phone_number": f"55503{i:02d}",
+            "birthday": date(1990, 1, i + 1),
+            "owner_id": owner_id,
+        }
+        for i in range(3)
+    ]
+    return setup_db.execute(insert(Contact).returning(Contact.__table__), rows).all()
+
+
+@pytest.fixture(scope="module")
+def shared_auth_headers(shared_contacts):
+    access_token = create_access_token(data={"sub": "shared_owner@example.com"})
+    return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.fixture(scope="module")
+def shared_admin_headers(setup_db, shared_roles):
+    # For the admin-only routes: listing every contact and deleting by id.
+    _insert_shared_user(setup_db, "shared_admin", shared_roles[RoleEnum.ADMIN])
+    access_token = create_access_token(data={"sub": "shared_admin@example.com"})
+    return {"Authorization": f"Bearer {access_token}"}
+
+
 @pytest.fixture
 def valid_token():
     payload = {"sub": "test_user"}
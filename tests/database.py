@@ -0,0 +1,30 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Registers every table on Base.metadata, whichever test module imports this first.
+from src.contacts.models import Contact  # noqa: F401
+
+SQLALCHEMY_DATABASE_URL = "sqlite+pysqlite:///file::memory:?cache=shared&uri=true"
+
+# Plain dict instead of the default LRU so tests can see what was compiled.
+STATEMENT_CACHE: dict = {}
+
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False, "uri": True},
+    poolclass=StaticPool,
+    execution_options={"compiled_cache": STATEMENT_CACHE},
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# pysqlite manages transactions itself and breaks SAVEPOINT; let SQLAlchemy emit BEGIN.
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
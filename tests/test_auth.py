@@ -10,18 +10,22 @@ from main import app
 
 client = TestClient(app)
 
+_REGISTER_PAYLOAD = {
+    "email": "tests@gmail.com",
+    "username": "testuser",
+    "password": "1234111",
+}
 
-def test_user_register(override_get_db, user_role):
+
+def _register_user():
+    # Each test's data is rolled back, so tests that need the user register it themselves.
     with patch.object(BackgroundTasks, "add_task"):
-        payload = {
-            "email": "tests@gmail.com",
-            "username": "testuser",
-            "password": "1234111",
-        }
-        response = client.post(
-            "/auth/register",
-            json=payload,
-        )
+        return client.post("/auth/register", json=_REGISTER_PAYLOAD)
+
+
+def test_user_register(override_get_db, user_role):
+    payload = _REGISTER_PAYLOAD
+    response = _register_user()
 
     assert response.status_code == 201
     data = response.json()
@@ -30,9 +34,22 @@ def test_user_register(override_get_db, user_role):
     assert data["id"] == user_role.id
 
 
-def test_user_login(override_get_db):
+def test_user_login(override_get_db, user_role):
+    _register_user()
     response = client.post(
         "/auth/token",
+        json={"username": "tests@gmail.com", "password": "1234111"},
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert "access_token" in data
+    assert "refresh_token" in data
+
+
+def test_user_login_form(override_get_db, user_role):
+    _register_user()
+    response = client.post(
+        "/auth/token-form",
         data={"username": "tests@gmail.com", "password": "1234111"},
     )
     assert response.status_code == 201
@@ -42,12 +59,8 @@ def test_user_login(override_get_db):
 
 
 def test_user_register_existing_email(override_get_db, user_role):
-    payload = {
-        "email": "tests@gmail.com",
-        "username": "testuser",
-        "password": "1234111",
-    }
-    client.post("/auth/register", json=payload)
+    payload = _REGISTER_PAYLOAD
+    _register_user()
 
     response = client.post("/auth/register", json=payload)
 
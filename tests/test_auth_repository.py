@@ -1,117 +1,137 @@
 import logging
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from faker import Faker
+from sqlalchemy import event
+from config.db import Base
 from src.auth.models import User, Role
+from src.auth import repo as auth_repo
 from src.auth.repo import UserRepository, RoleRepository
-from src.auth.schemas import RoleEnum
-from fastapi import HTTPException
+from src.auth.schemas import RoleEnum, UserCreate, UserResponse
+from tests.database import TestingSessionLocal, engine
 
 logging.basicConfig(level=logging.WARNING)
 
 
-class TestUserRepository(unittest.TestCase):
+class SQLiteTestCase(unittest.TestCase):
+    """Runs each test in a transaction on the in-memory test engine and rolls it back afterwards."""
+
+    @classmethod
+    def setUpClass(cls):
+        # The schema is created once; create_all skips tables that already exist.
+        Base.metadata.create_all(bind=engine)
+
+    def setUp(self):
+        auth_repo._ROLE_CACHE.clear()
+        self.addCleanup(auth_repo._ROLE_CACHE.clear)
+
+        connection = engine.connect()
+        transaction = connection.begin()
+        self.session = TestingSessionLocal(
+            bind=connection, join_transaction_mode="create_savepoint"
+        )
+        self.addCleanup(connection.close)
+        self.addCleanup(transaction.rollback)
+        self.addCleanup(self.session.close)
+
+        self.role = Role(name=RoleEnum.USER.value)
+        self.session.add(self.role)
+        self.session.commit()
+
+
+class TestUserRepository(SQLiteTestCase):
 
     def setUp(self):
+        super().setUp()
         self.faker = Faker()
-        self.session = MagicMock()
         self.repo = UserRepository(self.session)
 
         self.username = self.faker.user_name()
         self.email = self.faker.email()
-        self.password = self.faker.password()
-        self.role = RoleEnum.USER
+        self.hashed_password = self.faker.sha256()
+        self.user_create = UserCreate(
+            username=self.username,
+            email=self.email,
+            password=self.faker.password(),
+            role=RoleEnum.USER,
+        )
+        self.new_user = self.repo.create_user(self.user_create, self.hashed_password)
 
-        self.user_create_mock = MagicMock()
-        self.user_create_mock.username = self.username
-        self.user_create_mock.email = self.email
-        self.user_create_mock.password = self.password
-        self.user_create_mock.role = self.role
+    def test_create_user(self):
+        user = self.session.get(User, self.new_user.id)
+        self.assertEqual(user.username, self.username)
+        self.assertEqual(user.email, self.email)
+        self.assertEqual(user.hashed_password, self.hashed_password)
+        self.assertEqual(user.role_id, self.role.id)
+        self.assertFalse(user.is_active)
 
-        self.role_mock = MagicMock()
-        self.role_mock.id = 1
+    def test_create_user_returns_loaded_user(self):
+        statements = []
 
-        with patch.object(
-            RoleRepository, "get_role_by_name", return_value=self.role_mock
-        ):
-            self.new_user = self.repo.create_user(self.user_create_mock)
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
 
-    def test_create_user(self):
-        self.session.add.assert_called_once()
-        self.session.commit.assert_called_once()
-        self.session.refresh.assert_called_once_with(self.new_user)
+        event.listen(engine, "before_cursor_execute", record)
+        self.addCleanup(event.remove, engine, "before_cursor_execute", record)
+
+        response = UserResponse.model_validate(self.new_user)
+
+        self.assertEqual(statements, [])
+        self.assertEqual(response.email, self.email)
+        self.assertEqual(response.role.name, RoleEnum.USER)
 
-        self.assertEqual(self.new_user.username, self.username)
-        self.assertEqual(self.new_user.email, self.email)
-        self.assertEqual(self.new_user.role_id, 1)
+    def test_create_user_email_conflict(self):
+        self.assertIsNone(self.repo.create_user(self.user_create, self.hashed_password))
 
     def test_get_user(self):
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.new_user
-        )
         user = self.repo.get_user(self.username)
-        self.assertEqual(user.username, self.username)
+        self.assertEqual(user.id, self.new_user.id)
 
     def test_get_user_by_email(self):
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.new_user
-        )
         user = self.repo.get_user_by_email(self.email)
-        self.assertEqual(user.email, self.email)
+        self.assertEqual(user.id, self.new_user.id)
+
+    def test_get_user_missing(self):
+        self.assertIsNone(self.repo.get_user(self.faker.user_name() + "-missing"))
 
     def test_activate_user(self):
         self.assertFalse(self.new_user.is_active)
 
         self.repo.activate_user(self.new_user)
 
-        self.assertTrue(self.new_user.is_active)
-        self.session.add.assert_called_with(self.new_user)
-        self.session.commit.assert_called()
-        self.session.refresh.assert_called_with(self.new_user)
+        self.session.expire_all()
+        self.assertTrue(self.repo.get_user(self.username).is_active)
 
     def test_update_avatar(self):
         avatar_url = self.faker.image_url()
 
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.new_user
-        )
-
-        updated_user = self.repo.update_avatar(self.email, avatar_url)
-
-        self.assertEqual(updated_user.avatar, avatar_url)
-        self.assertEqual(
-            self.session.commit.call_count, 2
-        )  # Проверка на 1 вызов commit
-        self.assertEqual(self.session.refresh.call_count, 2)  # Проверка на 2
-
-    def test_update_avatar_user_not_found(self):
-        self.session.execute.return_value.scalar_one_or_none.return_value = None
-
-        avatar_url = self.faker.image_url()
-
-        with self.assertRaises(HTTPException) as context:
-            self.repo.update_avatar(self.email, avatar_url)
+        updated_user = self.repo.update_avatar(self.new_user, avatar_url)
 
-        self.assertEqual(context.exception.status_code, 404)
-        self.assertEqual(context.exception.detail, "User not found")
+        self.assertIs(updated_user, self.new_user)
+        self.session.expire_all()
+        self.assertEqual(self.repo.get_user(self.username).avatar, avatar_url)
 
 
-class TestRoleRepository(unittest.TestCase):
+class TestRoleRepository(SQLiteTestCase):
 
     def setUp(self):
-        self.session = MagicMock()
+        super().setUp()
         self.repo = RoleRepository(self.session)
         self.role_name = RoleEnum.USER
-        self.role_mock = MagicMock()
-        self.role_mock.name = self.role_name.value
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.role_mock
-        )
 
     def test_get_role_by_name(self):
         role = self.repo.get_role_by_name(self.role_name)
         self.assertEqual(role.name, self.role_name.value)
-        self.session.execute.assert_called_once()
+
+    def test_get_role_id_by_name_cached(self):
+        with patch.object(self.session, "scalar", wraps=self.session.scalar) as scalar:
+            self.assertEqual(
+                self.repo.get_role_id_by_name(self.role_name), self.role.id
+            )
+            self.assertEqual(
+                self.repo.get_role_id_by_name(self.role_name), self.role.id
+            )
+        scalar.assert_called_once()
 
 
 if __name__ == "__main__":
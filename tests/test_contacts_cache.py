@@ -0,0 +1,71 @@
+from fnmatch import fnmatch
+from unittest.mock import patch
+
+import pytest
+
+from src.contacts import cache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def scan_iter(self, match, count=None):
+        for key in list(self.data):
+            if fnmatch(key, match):
+                yield key
+
+    async def unlink(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis():
+    fake = FakeRedis()
+    with patch.object(cache.FastAPILimiter, "redis", fake):
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_cache_round_trip(redis):
+    key = cache.cache_key(1, "list", 10, 0, None)
+
+    await cache.set_cached(key, b'[{"id": 1}]', "1")
+
+    assert await cache.get_cached(key) == (b'[{"id": 1}]', "1")
+    assert key == "contacts:1:list:10:0:None"
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_without_cursor(redis):
+    key = cache.cache_key(1, "birthdays", 7)
+    assert await cache.get_cached(key) is None
+
+    await cache.set_cached(key, b"[]")
+
+    assert await cache.get_cached(key) == (b"[]", None)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_owner(redis):
+    await cache.set_cached(cache.cache_key(1, "birthdays", 7), b"[]")
+    await cache.set_cached(cache.cache_key(2, "birthdays", 7), b"[]")
+
+    await cache.invalidate(1)
+
+    assert list(redis.data) == [cache.cache_key(2, "birthdays", 7)]
+
+
+@pytest.mark.asyncio
+async def test_cache_disabled_without_redis():
+    with patch.object(cache.FastAPILimiter, "redis", None):
+        await cache.set_cached("contacts:1:list", b"[]")
+        assert await cache.get_cached("contacts:1:list") is None
+        await cache.invalidate()
@@ -1,167 +1,492 @@
-import unittest
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock
-from faker import Faker
-from datetime import datetime, timedelta
+import pytest
+import time_machine
+from datetime import date, datetime
 
-from sqlalchemy import extract, or_, select
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.exc import IntegrityError
+from src.auth.models import User
+from tests.database import STATEMENT_CACHE
 from src.contacts.models import Contact
-from src.contacts.schemas import ContactsCreate
-from src.contacts.repo import ContactsRepository
+from src.contacts.schemas import ContactsCreate, ContactsResponse
+from src.contacts.repo import ContactsRepository, _UPCOMING_BIRTHDAYS
 from sqlalchemy.orm.session import Session
 
+# Introspecting Session for spec= is the costly part of building the mock, so do it once.
+_SESSION_SPEC = dir(Session)
 
-class TestContactsRepository(unittest.TestCase):
-    def setUp(self):
-        self.faker = Faker()
-        self.session = MagicMock(spec=Session)
-        self.repo = ContactsRepository(self.session)
-
-        self.owner_id = self.faker.random_int(min=1, max=1000)
-        self.contact_id = self.faker.random_int(min=1, max=1000)
-        self.contact_email = self.faker.email()
-        self.contact_first_name = self.faker.first_name()
-        self.contact_last_name = self.faker.last_name()
-        self.contact_birthday = self.faker.date_of_birth(minimum_age=18, maximum_age=90)
-
-        self.contact_mock = MagicMock(spec=Contact)
-        self.contact_mock.id = self.contact_id
-        self.contact_mock.owner_id = self.owner_id
-        self.contact_mock.email = self.contact_email
-        self.contact_mock.first_name = self.contact_first_name
-        self.contact_mock.last_name = self.contact_last_name
-        self.contact_mock.birthday = self.contact_birthday
-
-    def test_get_contacts(self):
-        self.session.execute.return_value.scalars.return_value.all.return_value = [
-            self.contact_mock
-        ]
-        contacts = self.repo.get_contacts(self.owner_id)
-        self.assertEqual(contacts, [self.contact_mock])
-        self.session.execute.assert_called_once()
+# Birthday windows depend on the current date, so every test in this module runs on the same day.
+_TODAY = date(2024, 6, 15)
 
-    def test_get_contacts_all(self):
-        self.session.execute.return_value.scalars.return_value.all.return_value = [
-            self.contact_mock
-        ]
-        contacts = self.repo.get_contacts_all()
-        self.assertEqual(contacts, [self.contact_mock])
-        self.session.execute.assert_called_once()
-
-    def test_create_contacts(self):
-        contact_create = MagicMock(spec=ContactsCreate)
-        contact_create.first_name = self.faker.first_name()
-        contact_create.last_name = self.faker.last_name()
-        contact_create.email = self.faker.email()
-        contact_create.birthday = self.faker.date_of_birth(
-            minimum_age=18, maximum_age=90
-        )
 
-        self.session.execute.return_value.scalar_one_or_none.return_value = None
-        new_contact = self.repo.create_contacts(contact_create, self.owner_id)
-        self.session.add.assert_called_once()
-        self.session.commit.assert_called_once()
-        self.session.refresh.assert_called_once_with(new_contact)
+@pytest.fixture(scope="module", autouse=True)
+def _freeze_today():
+    with time_machine.travel(_TODAY, tick=False):
+        yield
 
-    def test_search_contacts(self):
-        self.session.execute.return_value.scalars.return_value.all.return_value = [
-            self.contact_mock
-        ]
-        query = self.faker.word()
-        contacts = self.repo.search_contacts(self.owner_id, query)
-        self.assertEqual(contacts, [self.contact_mock])
-        self.session.execute.assert_called_once()
-
-    def test_get_contact_by_id_and_owner(self):
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.contact_mock
+
+# The repository never inspects these values, so fixed literals are enough.
+_OWNER_ID = 7
+_CONTACT_ID = 42
+_CONTACT_EMAIL = "john.doe@example.com"
+_CONTACT_FIRST_NAME = "John"
+_CONTACT_LAST_NAME = "Doe"
+_CONTACT_BIRTHDAY = date(1990, 5, 17)
+
+
+@pytest.fixture
+def session():
+    return MagicMock(spec=_SESSION_SPEC)
+
+
+@pytest.fixture
+def repo(session):
+    return ContactsRepository(session)
+
+
+@pytest.fixture(scope="module")
+def contact_mock():
+    # Only read and compared by identity, so a plain namespace stands in for Contact.
+    return SimpleNamespace(
+        id=_CONTACT_ID,
+        owner_id=_OWNER_ID,
+        email=_CONTACT_EMAIL,
+        first_name=_CONTACT_FIRST_NAME,
+        last_name=_CONTACT_LAST_NAME,
+        birthday=_CONTACT_BIRTHDAY,
+    )
+
+
+def _stub_scalars_all(session, rows):
+    session.scalars.return_value.all.return_value = rows
+
+
+def _stub_scalar(session, value):
+    session.scalar.return_value = value
+
+
+def test_get_contacts(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+    contacts = repo.get_contacts(_OWNER_ID)
+    assert contacts == [contact_mock]
+    session.scalars.assert_called_once()
+
+
+def test_get_contacts_after_id(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+    repo.get_contacts(_OWNER_ID, limit=5, after_id=_CONTACT_ID)
+    query = session.scalars.call_args[0][0]
+    compiled = query.compile()
+    assert "contacts.id >" in str(compiled)
+    assert "OFFSET" not in str(compiled)
+    assert compiled.params["after_id_1"] == _CONTACT_ID
+
+
+def test_get_contacts_offset_deprecated(session, repo):
+    _stub_scalars_all(session, [])
+    with pytest.warns(DeprecationWarning):
+        repo.get_contacts(_OWNER_ID, offset=10)
+
+
+def test_get_contacts_all(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+    contacts = repo.get_contacts_all()
+    assert contacts == [contact_mock]
+    session.scalars.assert_called_once()
+
+
+def test_get_contacts_all_after_id(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+    repo.get_contacts_all(limit=5, after_id=_CONTACT_ID)
+    compiled = session.scalars.call_args[0][0].compile()
+    assert "contacts.id >" in str(compiled)
+    assert "ORDER BY contacts.id" in str(compiled)
+    assert compiled.params["after_id_1"] == _CONTACT_ID
+
+
+def test_create_contacts(session, repo):
+    contact_create = ContactsCreate(
+        first_name="Jane",
+        last_name="Roe",
+        email="jane.roe@example.com",
+        phone_number="5550100",
+        birthday=date(1985, 3, 2),
+    )
+
+    _stub_scalar(session, None)
+    new_contact = repo.create_contacts(contact_create, _OWNER_ID)
+    session.add.assert_called_once()
+    session.commit.assert_called_once()
+    session.refresh.assert_called_once_with(new_contact)
+
+
+def test_create_contacts_bulk(session, repo):
+    contacts = [
+        ContactsCreate(
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"bulk{i}@example.com",
+            phone_number=f"555010{i}",
+            birthday=_CONTACT_BIRTHDAY,
         )
-        contact = self.repo.get_contact_by_id_and_owner(self.owner_id, self.contact_id)
-        self.assertEqual(contact, self.contact_mock)
-        self.session.execute.assert_called_once()
+        for i in range(3)
+    ]
+    _stub_scalars_all(session, [1, 2, 3])
+
+    contact_ids = repo.create_contacts_bulk(contacts, _OWNER_ID)
+
+    assert contact_ids == [1, 2, 3]
+    rows = session.scalars.call_args.args[1]
+    assert len(rows) == 3
+    assert all(row["owner_id"] == _OWNER_ID for row in rows)
+    session.commit.assert_called_once()
+    session.refresh.assert_not_called()
+
+
+def test_search_contacts(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+    query = "query"
+    contacts = repo.search_contacts(_OWNER_ID, query)
+    assert contacts == [contact_mock]
+    session.scalars.assert_called_once()
+
+
+def test_search_contacts_multiple_words(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+    query = f"{_CONTACT_FIRST_NAME} {_CONTACT_LAST_NAME}"
+    contacts = repo.search_contacts(_OWNER_ID, query)
+    assert contacts == [contact_mock]
+    statement = session.scalars.call_args.args[0]
+    assert "plainto_tsquery" in str(statement)
+
+
+def test_get_contact_by_id_and_owner(session, repo, contact_mock):
+    _stub_scalar(session, contact_mock)
+    contact = repo.get_contact_by_id_and_owner(_OWNER_ID, _CONTACT_ID)
+    assert contact == contact_mock
+    session.scalar.assert_called_once()
+
+
+def test_get_contact_by_id(session, repo, contact_mock):
+    _stub_scalar(session, contact_mock)
+    contact = repo.get_contact_by_id(_CONTACT_ID)
+    assert contact == contact_mock
+    session.scalar.assert_called_once()
+    assert session.scalar.call_args.args[1] == {"contact_id": _CONTACT_ID}
+
+
+def test_delete_contact(session, repo, contact_mock):
+    session.get.return_value = contact_mock
+    repo.delete_contact(_CONTACT_ID)
+    session.delete.assert_called_once_with(contact_mock)
+    session.commit.assert_called_once()
+
+
+def test_delete_contact_returning(session, repo):
+    _stub_scalar(session, _CONTACT_ID)
+    deleted_id = repo.delete_contact_returning(_CONTACT_ID)
+    assert deleted_id == _CONTACT_ID
+    session.scalar.assert_called_once()
+    session.commit.assert_called_once()
+
+
+def test_get_upcoming_birthdays(session, repo, contact_mock):
+    _stub_scalars_all(session, [contact_mock])
+
+    contacts = repo.get_upcoming_birthdays(_OWNER_ID, days=7)
+
+    assert contacts == [contact_mock]
+    session.scalars.assert_called_once()
+    statement, params = session.scalars.call_args.args
+    assert statement is _UPCOMING_BIRTHDAYS
+    assert params == {
+        "owner_id": _OWNER_ID,
+        "start_month_day": 615,
+        "end_month_day": 622,
+        "wrapped": False,
+    }
 
-    def test_get_contact_by_id(self):
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.contact_mock
+
+def test_get_upcoming_birthdays_past_year_end(session, repo):
+    _stub_scalars_all(session, [])
+
+    with time_machine.travel(date(2024, 12, 29), tick=False):
+        repo.get_upcoming_birthdays(_OWNER_ID, days=7)
+
+    statement, params = session.scalars.call_args.args
+    assert statement is _UPCOMING_BIRTHDAYS
+    assert params == {
+        "owner_id": _OWNER_ID,
+        "start_month_day": 1229,
+        "end_month_day": 105,
+        "wrapped": True,
+    }
+
+
+@pytest.mark.parametrize("identifier", [99, "other@example.com", "query"])
+def test_find_contact(session, repo, contact_mock, identifier):
+    _stub_scalar(session, contact_mock)
+
+    contact = repo.find_contact(_OWNER_ID, identifier)
+
+    assert contact == contact_mock
+    session.scalar.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "identifier, predicate",
+    [
+        (str(_CONTACT_ID), "contacts.id ="),
+        (_CONTACT_EMAIL, "contacts.email ="),
+        (f"{_CONTACT_FIRST_NAME} {_CONTACT_LAST_NAME}", "contacts.full_name ="),
+        (_CONTACT_FIRST_NAME, "contacts.first_name ="),
+        ("²", "contacts.first_name ="),
+        ("٤٢", "contacts.first_name ="),
+    ],
+)
+def test_find_contact_dispatches_on_identifier(
+    session, repo, contact_mock, identifier, predicate
+):
+    _stub_scalar(session, contact_mock)
+    repo.find_contact(_OWNER_ID, identifier)
+    statement = str(session.scalar.call_args.args[0])
+    assert predicate in statement
+    assert " OR " not in statement
+
+
+def test_find_contact_falls_back_to_any_column(session, repo, contact_mock):
+    session.scalar.side_effect = [None, contact_mock]
+
+    contact = repo.find_contact(_OWNER_ID, "Mary Ann")
+
+    assert contact == contact_mock
+    assert session.scalar.call_count == 2
+    assert " OR " in str(session.scalar.call_args.args[0])
+
+
+def test_find_contact_cached(session, repo, contact_mock):
+    _stub_scalar(session, contact_mock)
+
+    first = repo.find_contact(_OWNER_ID, _CONTACT_EMAIL)
+    second = repo.find_contact(_OWNER_ID, _CONTACT_EMAIL)
+
+    assert first is second
+    session.scalar.assert_called_once()
+
+
+def test_find_contact_cache_cleared_on_delete(session, repo, contact_mock):
+    _stub_scalar(session, contact_mock)
+    repo.find_contact(_OWNER_ID, _CONTACT_EMAIL)
+
+    repo.delete_contact_returning(_CONTACT_ID)
+    repo.find_contact(_OWNER_ID, _CONTACT_EMAIL)
+
+    assert session.scalar.call_count == 3
+
+
+def test_update_contact(session, repo, contact_mock):
+    contact_update = ContactsCreate(
+        first_name="Johnny",
+        last_name="Doe",
+        email="john.updated@example.com",
+        phone_number="5550101",
+        birthday=_CONTACT_BIRTHDAY,
+    )
+
+    _stub_scalar(session, contact_mock)
+
+    updated_contact = repo.update_contact(_CONTACT_ID, _OWNER_ID, contact_update)
+    assert updated_contact == contact_mock
+    session.scalar.assert_called()
+    session.commit.assert_called_once()
+
+
+def test_update_contact_email_in_use(session, repo, contact_mock):
+    contact_update = ContactsCreate(
+        first_name=_CONTACT_FIRST_NAME,
+        last_name=_CONTACT_LAST_NAME,
+        email="taken@example.com",
+        phone_number="5550102",
+        birthday=_CONTACT_BIRTHDAY,
+    )
+
+    session.scalar.side_effect = [
+        contact_mock,
+        IntegrityError("UPDATE contacts", {}, Exception("unique")),
+    ]
+
+    with pytest.raises(ValueError):
+        repo.update_contact(_CONTACT_ID, _OWNER_ID, contact_update)
+    session.rollback.assert_called_once()
+    session.commit.assert_not_called()
+
+
+@pytest.fixture
+def owner(db_session, user_role):
+    user = User(
+        username="contacts_owner",
+        email="contacts_owner@example.com",
+        hashed_password="not-a-real-hash",
+        role_id=user_role.id,
+    )
+    db_session.add(user)
+    db_session.flush()
+    return user
+
+
+def test_get_contacts_query_count(db_session, owner):
+    db_session.add_all(
+        Contact(
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"contact{i}@example.com",
+            phone_number=f"555000{i}",
+            birthday=datetime(1990, 1, i + 1).date(),
+            owner_id=owner.id,
         )
-        contact = self.repo.get_contact_by_id(self.contact_id)
-        self.assertEqual(contact, self.contact_mock)
-        self.session.execute.assert_called_once()
-
-    def test_delete_contact(self):
-        self.session.get.return_value = self.contact_mock
-        self.repo.delete_contact(self.contact_id)
-        self.session.delete.assert_called_once_with(self.contact_mock)
-        self.session.commit.assert_called_once()
-
-    def test_get_upcoming_birthdays(self):
-        today = datetime.today()
-        upcoming_date = today + timedelta(days=7)
-        today_day_of_year = today.timetuple().tm_yday
-        upcoming_day_of_year = upcoming_date.timetuple().tm_yday
-
-        self.session.execute.return_value.scalars.return_value.all.return_value = [
-            self.contact_mock
+        for i in range(5)
+    )
+    db_session.flush()
+    db_session.expunge_all()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        contacts = ContactsRepository(db_session).get_contacts(owner.id, limit=100)
+        response = [
+            ContactsResponse.model_validate(c, from_attributes=True) for c in contacts
         ]
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
 
-        contacts = self.repo.get_upcoming_birthdays(self.owner_id, days=7)
-        self.assertEqual(contacts, [self.contact_mock])
-
-        if today_day_of_year <= upcoming_day_of_year:
-            query = select(Contact).filter(
-                Contact.owner_id == self.owner_id,
-                extract("doy", Contact.birthday).between(
-                    today_day_of_year, upcoming_day_of_year
-                ),
-            )
-        else:
-            query = select(Contact).filter(
-                Contact.owner_id == self.owner_id,
-                or_(
-                    extract("doy", Contact.birthday) >= today_day_of_year,
-                    extract("doy", Contact.birthday) <= upcoming_day_of_year,
-                ),
-            )
-
-        self.session.execute.assert_called_once()
-
-    def test_find_contact(self):
-        contact_id = self.faker.random_int(min=1, max=1000)
-        contact_email = self.faker.email()
-        query = self.faker.word()
-
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.contact_mock
-        )
+    assert len(response) == 5
+    assert len(statements) <= 2
 
-        contact = self.repo.find_contact(self.owner_id, contact_id)
-        self.assertEqual(contact, self.contact_mock)
 
-        contact = self.repo.find_contact(self.owner_id, contact_email)
-        self.assertEqual(contact, self.contact_mock)
+def test_find_contact_by_full_name(db_session, owner):
+    db_session.add(
+        Contact(
+            first_name="Jane",
+            last_name="Roe",
+            email="jane.roe@example.com",
+            phone_number="5550100",
+            birthday=datetime(1991, 2, 3).date(),
+            owner_id=owner.id,
+        )
+    )
+    db_session.flush()
 
-        contact = self.repo.find_contact(self.owner_id, query)
-        self.assertEqual(contact, self.contact_mock)
+    contact = ContactsRepository(db_session).find_contact(owner.id, "Jane Roe")
 
-        self.session.execute.assert_called()
+    assert contact is not None
+    assert contact.full_name == "Jane Roe"
 
-    def test_update_contact(self):
-        contact_update = MagicMock(spec=ContactsCreate)
-        contact_update.email = self.faker.email()
-        contact_update.first_name = self.faker.first_name()
-        contact_update.last_name = self.faker.last_name()
 
-        self.session.execute.return_value.scalar_one_or_none.return_value = (
-            self.contact_mock
+@pytest.mark.parametrize(
+    "today, days, birthdays, expected",
+    [
+        # Birth years with and without February 29 keep the same calendar day.
+        (_TODAY, 7, [date(1991, 6, 15), date(1991, 6, 22), date(1991, 6, 23)], [0, 1]),
+        (_TODAY, 7, [date(1992, 6, 15), date(1992, 6, 22), date(1992, 6, 23)], [0, 1]),
+        # A window past December 31 continues at the start of the year.
+        (
+            date(2024, 12, 30),
+            5,
+            [
+                date(1990, 12, 29),
+                date(1990, 12, 31),
+                date(1991, 1, 4),
+                date(1991, 1, 5),
+            ],
+            [1, 2],
+        ),
+        # In a non-leap year, February 29 falls between February 28 and March 1.
+        (
+            date(2023, 2, 27),
+            2,
+            [date(1992, 2, 29), date(1991, 3, 1), date(1991, 3, 2)],
+            [0, 1],
+        ),
+    ],
+)
+def test_get_upcoming_birthdays_window(
+    db_session, owner, today, days, birthdays, expected
+):
+    db_session.add_all(
+        Contact(
+            first_name=f"Birthday{i}",
+            last_name="Soon",
+            email=f"birthday{i}@example.com",
+            phone_number=f"555020{i}",
+            birthday=birthday,
+            owner_id=owner.id,
         )
-        self.session.execute.return_value.scalar.return_value = self.contact_mock
+        for i, birthday in enumerate(birthdays)
+    )
+    db_session.flush()
 
-        updated_contact = self.repo.update_contact(
-            self.contact_id, self.owner_id, contact_update
+    with time_machine.travel(today, tick=False):
+        contacts = ContactsRepository(db_session).get_upcoming_birthdays(
+            owner.id, days=days
         )
-        self.assertEqual(updated_contact, self.contact_mock)
-        self.session.execute.assert_called()
-        self.session.commit.assert_called_once()
 
+    assert sorted(c.first_name for c in contacts) == [f"Birthday{i}" for i in expected]
+
+
+def _contacts_selects(db_session, call):
+    """Runs call and returns the execution context of each SELECT it sent to the contacts table."""
+    contexts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT") and "FROM contacts" in statement:
+            contexts.append(context)
+
+    connection = db_session.connection()
+    event.listen(connection, "after_cursor_execute", record)
+    try:
+        call()
+    finally:
+        event.remove(connection, "after_cursor_execute", record)
+    return contexts
+
+
+@pytest.mark.parametrize(
+    "method, first_args, repeat_args",
+    [
+        ("get_contact_by_id", (1,), (2,)),
+        ("get_contacts", (1, 5, 0, 1), (2, 20, 0, 2)),
+    ],
+)
+def test_repeated_lookup_hits_statement_cache(
+    db_session, method, first_args, repeat_args
+):
+    lookup = getattr(ContactsRepository(db_session), method)
+    _contacts_selects(db_session, lambda: lookup(*first_args))
+
+    # The repeat differs only in bound values, so it must reuse the compiled form.
+    repeats = _contacts_selects(db_session, lambda: lookup(*repeat_args))
+
+    assert [context.cache_hit for context in repeats] == [CACHE_HIT]
+    assert repeats[0].compiled in STATEMENT_CACHE.values()
+
+
+def test_repo_imports_in_fresh_interpreter():
+    # The module-level load options configure the mappers, so the import alone must resolve "User".
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.contacts.repo"],
+        cwd=Path(__file__).resolve().parent.parent,
+        capture_output=True,
+        text=True,
+    )
 
-if __name__ == "__main__":
-    unittest.main()
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,234 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from fastapi import status
+from fastapi.testclient import TestClient
+from src.contacts.models import Contact
+from src.contacts.routers import BULK_CREATE_LIMIT
+from tests.database import engine
+
+# Routes read and write through the module connection that holds the seed rows.
+pytestmark = pytest.mark.usefixtures("shared_get_db", "clear_contacts_cache")
+
+_CREATE_BODY = {
+    "first_name": "John",
+    "last_name": "Smith",
+    "email": "john.smith@example.com",
+    "phone_number": "1234567890",
+    "birthday": "1990-01-01",
+    "additional_info": "Additional info",
+}
+_UPDATE_BODY = {
+    "first_name": "Jane",
+    "last_name": "Doe",
+    "email": "jane.doe.updated@example.com",
+    "phone_number": "0987654321",
+    "birthday": "1992-02-02",
+    "additional_info": "Updated info",
+}
+
+
+def test_ping(client: TestClient):
+    response = client.get("/ping")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"message": "pong"}
+
+
+def test_create_contact(client: TestClient, auth_headers, db_session):
+    response = client.post("/contacts/", headers=auth_headers, json=_CREATE_BODY)
+    assert response.status_code == status.HTTP_201_CREATED
+    data = response.json()
+    assert data["first_name"] == _CREATE_BODY["first_name"]
+    assert data["last_name"] == _CREATE_BODY["last_name"]
+    assert data["email"] == _CREATE_BODY["email"]
+
+
+def _bulk_body(count: int) -> list[dict]:
+    return [
+        {**_CREATE_BODY, "email": f"bulk.contact{i}@example.com"} for i in range(count)
+    ]
+
+
+def test_create_contacts_bulk(client: TestClient, auth_headers):
+    response = client.post("/contacts/bulk", headers=auth_headers, json=_bulk_body(3))
+    assert response.status_code == status.HTTP_201_CREATED
+    contact_ids = response.json()
+    assert len(contact_ids) == 3
+
+    # Verify creation: the owner's list returns the new ids in request order.
+    response = client.get("/contacts/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert [c["id"] for c in response.json()] == contact_ids
+
+
+def test_create_contacts_bulk_email_in_use(client: TestClient, auth_headers):
+    body = _bulk_body(2)
+    body[1]["email"] = body[0]["email"]
+
+    response = client.post("/contacts/bulk", headers=auth_headers, json=body)
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {"detail": "Email already in use"}
+
+    # Nothing from the rejected batch is kept.
+    response = client.get("/contacts/", headers=auth_headers)
+    assert response.json() == []
+
+
+def test_create_contacts_bulk_too_many(client: TestClient, auth_headers):
+    response = client.post(
+        "/contacts/bulk",
+        headers=auth_headers,
+        json=_bulk_body(BULK_CREATE_LIMIT + 1),
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_contacts(client: TestClient, shared_auth_headers, shared_contacts):
+    response = client.get("/contacts/", headers=shared_auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    contacts = response.json()
+    assert len(contacts) == len(shared_contacts)
+    assert contacts[0]["email"] == shared_contacts[0].email
+
+
+def test_get_contacts_all(client: TestClient, shared_admin_headers, shared_contacts):
+    response = client.get("/contacts/all/", headers=shared_admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    contacts = response.json()
+    assert len(contacts) == len(shared_contacts)
+    assert contacts[0]["email"] == shared_contacts[0].email
+
+
+def test_search_contacts(client: TestClient, shared_auth_headers, shared_contacts):
+    contact = shared_contacts[0]
+    response = client.get(
+        f"/contacts/search/?query={contact.email}", headers=shared_auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    contacts = response.json()
+    assert len(contacts) == 1
+    assert contacts[0]["email"] == contact.email
+
+
+def test_delete_contact(
+    client: TestClient,
+    auth_headers,
+    shared_admin_headers,
+    test_user_contact: Contact,
+):
+    # Deleting by id is admin-only.
+    response = client.delete(
+        f"/contacts/{test_user_contact.id}", headers=shared_admin_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"message": f"Contact {test_user_contact.id} deleted"}
+
+    # Verify deletion: the owner's list no longer has the contact.
+    response = client.get("/contacts/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert test_user_contact.id not in [c["id"] for c in response.json()]
+
+
+def test_get_upcoming_birthdays(
+    client: TestClient, shared_auth_headers, shared_contacts
+):
+    # A full-year window keeps the assertion independent of today's date.
+    response = client.get(
+        "/contacts/upcoming_birthdays/?days=366", headers=shared_auth_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    contacts = response.json()
+    assert len(contacts) == len(shared_contacts)
+
+
+def test_update_contact(client: TestClient, auth_headers, test_user_contact: Contact):
+    response = client.put(
+        f"/contacts/{test_user_contact.id}", headers=auth_headers, json=_UPDATE_BODY
+    )
+    assert response.status_code == status.HTTP_200_OK
+    updated_contact = response.json()
+    assert updated_contact["email"] == _UPDATE_BODY["email"]
+
+    # Verify update: the owner's list returns the new email.
+    response = client.get("/contacts/", headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    contacts = {c["id"]: c for c in response.json()}
+    assert contacts[test_user_contact.id]["email"] == _UPDATE_BODY["email"]
+
+
+def test_update_contact_email_in_use(
+    client: TestClient, auth_headers, db_session, test_user_contact: Contact
+):
+    other = Contact(
+        first_name="Other",
+        last_name="Contact",
+        email="other.contact@example.com",
+        phone_number="5550199",
+        birthday=test_user_contact.birthday,
+        owner_id=test_user_contact.owner_id,
+    )
+    db_session.add(other)
+    db_session.flush()
+
+    response = client.put(
+        f"/contacts/{test_user_contact.id}",
+        headers=auth_headers,
+        json={**_UPDATE_BODY, "email": other.email},
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {"detail": "Email already in use"}
+
+
+@pytest.fixture
+def event_loop_queries():
+    # Collects the SQL that runs on the event loop thread instead of a worker thread.
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_write_routes_query_off_event_loop(
+    client: TestClient, auth_headers, test_user_contact: Contact, event_loop_queries
+):
+    response = client.post("/contacts/", headers=auth_headers, json=_CREATE_BODY)
+    assert response.status_code == status.HTTP_201_CREATED
+    response = client.put(
+        f"/contacts/{test_user_contact.id}", headers=auth_headers, json=_UPDATE_BODY
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.post("/contacts/bulk", headers=auth_headers, json=_bulk_body(2))
+    assert response.status_code == status.HTTP_201_CREATED
+
+    assert event_loop_queries == []
+
+
+def test_get_contacts_cached_until_write(
+    client: TestClient, auth_headers, db_session, test_user_contact: Contact
+):
+    response = client.get("/contacts/", headers=auth_headers)
+    assert [c["id"] for c in response.json()] == [test_user_contact.id]
+
+    # A row written behind the routes' back is not seen while the page is cached.
+    other = {**_CREATE_BODY, "birthday": test_user_contact.birthday}
+    db_session.add(Contact(**other, owner_id=test_user_contact.owner_id))
+    db_session.flush()
+    response = client.get("/contacts/", headers=auth_headers)
+    assert [c["id"] for c in response.json()] == [test_user_contact.id]
+
+    # A write through the routes drops the owner's cached pages.
+    response = client.put(
+        f"/contacts/{test_user_contact.id}", headers=auth_headers, json=_UPDATE_BODY
+    )
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get("/contacts/", headers=auth_headers)
+    assert len(response.json()) == 2
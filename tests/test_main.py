@@ -3,14 +3,6 @@ from httpx import AsyncClient
 from fastapi.testclient import TestClient
 from unittest.mock import patch
 
-from main import app
-
-
-@pytest.fixture(scope="module")
-def client():
-    with TestClient(app) as client:
-        yield client
-
 
 @pytest.mark.asyncio
 async def test_read_main(client: TestClient):
@@ -1,12 +1,12 @@
-from httpx import AsyncClient
-import pytest
+from fastapi.testclient import TestClient
 
 from main import app
 
+# /ping needs no startup work, so skip the lifespan (and its Redis connection).
+client = TestClient(app)
 
-@pytest.mark.asyncio
-async def test_health_check():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.get("/ping")
+
+def test_health_check():
+    response = client.get("/ping")
     assert response.status_code == 200
     assert response.json() == {"message": "pong"}
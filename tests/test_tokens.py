@@ -1,15 +1,8 @@
+import base64
+import hmac
 from datetime import timedelta
-from unittest.mock import AsyncMock, patch
-from fastapi.testclient import TestClient
-from src.auth.schemas import TokenData
-from src.auth.utils import create_access_token, decode_access_token
-from main import app
-from src.contacts.models import Contact
-import logging
-
-logging.getLogger("faker.factory").setLevel(logging.ERROR)
-
-client = TestClient(app)
+from unittest.mock import patch
+from src.auth.utils import SECRET_KEY, create_access_token, decode_access_token
 
 
 def test_decode_access_token_success():
@@ -27,6 +20,28 @@ def test_decode_access_token_expired():
     assert decoded_token is None
 
 
+def test_decode_access_token_cached():
+    access_token = create_access_token(data={"sub": "cached_user"})
+    decoded_token = decode_access_token(access_token)
+    with patch("src.auth.utils._decode") as token_decode:
+        assert decode_access_token(access_token) is decoded_token
+    token_decode.assert_not_called()
+
+
+def test_access_token_signature_is_hs256():
+    access_token = create_access_token(data={"sub": "test_user"})
+    signing_input, _, signature = access_token.rpartition(".")
+    expected = hmac.digest(SECRET_KEY.encode(), signing_input.encode(), "sha256")
+    assert signature == base64.urlsafe_b64encode(expected).rstrip(b"=").decode()
+
+
+def test_decode_access_token_tampered():
+    access_token = create_access_token(data={"sub": "test_user"})
+    header, payload, signature = access_token.split(".")
+    forged_signature = ("A" if signature[0] != "A" else "B") + signature[1:]
+    assert decode_access_token(f"{header}.{payload}.{forged_signature}") is None
+
+
 def test_decode_access_token_invalid(invalid_token):
     token_data = decode_access_token(invalid_token)
     assert token_data is None